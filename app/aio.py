@@ -0,0 +1,134 @@
+"""Long-lived asyncio event loop for async upstream I/O.
+
+edge-tts, the async upstream HTTP client (see :mod:`app.upstream`) and any
+other asyncio client run on one background loop owned by a daemon thread,
+instead of a fresh ``asyncio.run`` per request. Flask
+handlers and the CLI hand coroutines over with :func:`submit` and get a
+``concurrent.futures.Future`` back, so concurrent requests are multiplexed
+on the same loop rather than each paying loop setup and teardown.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import AsyncIterator, Awaitable, Iterator, Optional, TypeVar
+
+from .cancel import CancelToken
+
+
+T = TypeVar("T")
+
+
+class AsyncWorker:
+    def __init__(self, name: str = "jarvis-async") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def _run(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def submit(self, coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """Schedule ``coro`` on the worker loop; safe to call from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None, cancel: Optional[CancelToken] = None) -> T:
+        """Run ``coro`` on the worker loop and block the calling thread for its result.
+
+        Cancelling ``cancel`` cancels the task on the loop and raises
+        ``concurrent.futures.CancelledError`` here.
+        """
+        future = self.submit(coro)
+        release = cancel.on_cancel(future.cancel) if cancel is not None else None
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+        finally:
+            if release is not None:
+                release()
+
+    def iterate(
+        self, agen: AsyncIterator[T], timeout: Optional[float] = None, cancel: Optional[CancelToken] = None
+    ) -> Iterator[T]:
+        """Synchronous iterator over an async generator running on the worker loop.
+
+        Items are pulled one at a time, so a slow consumer applies
+        backpressure instead of the loop buffering the whole stream.
+        Cancelling ``cancel`` interrupts the pending item and ends the
+        iteration quietly.
+        """
+        pending: list = []
+
+        async def next_item():
+            pending[:] = [asyncio.current_task()]
+            return await agen.__anext__()
+
+        async def close():
+            # A cancelled or timed-out item is still unwinding inside the generator
+            if pending and not pending[0].done():
+                await asyncio.wait(pending)
+            aclose = getattr(agen, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+        try:
+            while True:
+                try:
+                    yield self.run(next_item(), timeout, cancel)
+                except StopAsyncIteration:
+                    return
+                except concurrent.futures.CancelledError:
+                    if cancel is not None and cancel.cancelled:
+                        return
+                    raise
+        finally:
+            self.run(close())
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is None or self._thread is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+
+_worker = AsyncWorker()
+
+
+def get_worker() -> AsyncWorker:
+    """Return the process-wide worker, starting its loop on first use."""
+    _worker.start()
+    return _worker
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None, cancel: Optional[CancelToken] = None) -> T:
+    return get_worker().run(coro, timeout, cancel)
+
+
+def iterate_async(
+    agen: AsyncIterator[T], timeout: Optional[float] = None, cancel: Optional[CancelToken] = None
+) -> Iterator[T]:
+    return get_worker().iterate(agen, timeout, cancel)
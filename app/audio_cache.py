@@ -0,0 +1,290 @@
+"""Content-addressed on-disk cache for synthesized speech.
+
+Each clip is stored as ``<sha256>.mp3`` where the hash covers the
+preprocessed text, the voice and the speaking rate, so identical answers
+(the canned fallback replies in particular) are synthesized once and then
+served straight from disk. The directory is bounded in size; when it grows
+past the limit the least recently used clips are deleted.
+
+Pre-render every canned reply, whole (as /api/voice asks for it) and
+sentence by sentence (as the streamed voice routes ask for it), with::
+
+    python -m app.audio_cache warm server.cv_data
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+from .cancel import CancelToken, cancelled
+from .config import settings
+
+
+# Temp files of clips still being written; older ones were left by a crash or
+# kill (another worker sharing the directory may be writing a newer one)
+STALE_PART_SECONDS = 3600
+
+
+def preprocess_text(text: str) -> str:
+    """Collapse whitespace so cosmetic differences do not split the cache."""
+    return " ".join(text.split())
+
+
+def audio_key(text: str, voice: str, rate: str) -> str:
+    material = json.dumps([preprocess_text(text), voice, rate])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._remove_stale_parts()
+        self._total_bytes = sum(size for _path, size, _used in self._entries())
+
+    def _remove_stale_parts(self) -> None:
+        cutoff = time.time() - STALE_PART_SECONDS
+        for name in os.listdir(self.directory):
+            if not name.endswith(".part"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.unlink(path)
+            except OSError:
+                continue
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def _entries(self) -> list:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".mp3"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # mtime doubles as the last-used time for LRU eviction
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        writer = self.open_writer(key)
+        writer.write(data)
+        writer.commit()
+
+    def open_writer(self, key: str) -> "_ClipWriter":
+        """Start writing a clip incrementally; it becomes visible on ``commit``."""
+        return _ClipWriter(self, key)
+
+    def _commit(self, tmp_path: str, key: str, size: int) -> None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                previous = os.path.getsize(path)
+            except OSError:
+                previous = 0
+            os.replace(tmp_path, path)
+            self._total_bytes += size - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def iter_clip(self, key: str, chunk_size: int = 16384) -> Optional[Iterator[bytes]]:
+        """Iterate a cached clip in chunks, or return None on a miss."""
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+
+        def chunks():
+            with f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+
+        return chunks()
+
+    def stream_through(self, key: str, chunks: Iterable[bytes], cancel: Optional[CancelToken] = None) -> Iterator[bytes]:
+        """Pass ``chunks`` through while storing them; partial or cancelled streams are discarded."""
+        writer = self.open_writer(key)
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+                yield chunk
+        except BaseException:
+            writer.discard()
+            raise
+        if cancelled(cancel):
+            writer.discard()
+            return
+        writer.commit()
+
+    def _evict(self) -> None:
+        for path, size, _used in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+
+    def get_or_render(self, text: str, voice: str, rate: str, render: Callable[[], bytes]) -> tuple:
+        """Return ``(key, audio)``, calling ``render`` only on a cache miss."""
+        key = audio_key(text, voice, rate)
+        data = self.get(key)
+        if data is None:
+            data = render()
+            if data:
+                self.put(key, data)
+        return key, data
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class _ClipWriter:
+    """Writes a clip to a temp file and renames it into place on commit,
+    so readers never see a partial clip."""
+
+    def __init__(self, cache: AudioCache, key: str) -> None:
+        self._cache = cache
+        self._key = key
+        self._size = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=cache.directory, suffix=".part")
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._size += len(chunk)
+
+    def commit(self) -> None:
+        self._file.close()
+        if self._size == 0:
+            os.unlink(self._tmp_path)
+            return
+        self._cache._commit(self._tmp_path, self._key, self._size)
+
+    def discard(self) -> None:
+        self._file.close()
+        try:
+            os.unlink(self._tmp_path)
+        except OSError:
+            pass
+
+
+def speech_stream(
+    cache: Optional[AudioCache], text: str, voice: str, rate: str, cancel: Optional[CancelToken] = None
+) -> Iterator[bytes]:
+    """MP3 chunks for ``text``: from disk on a hit, otherwise synthesized
+    on the fly and stored as they go out. ``cancel`` stops the synthesis."""
+    from .tts import iter_speech
+
+    key = audio_key(text, voice, rate)
+    if cache is not None:
+        cached = cache.iter_clip(key)
+        if cached is not None:
+            return cached
+    chunks = iter_speech(preprocess_text(text), voice, rate, cancel)
+    if cache is None:
+        return chunks
+    return cache.stream_through(key, chunks, cancel)
+
+
+def create_audio_cache() -> Optional[AudioCache]:
+    """Build the audio cache configured in settings, or None when it is off."""
+    if settings.tts_cache_max_mb <= 0:
+        return None
+    return AudioCache(settings.tts_cache_dir, settings.tts_cache_max_mb * 1024 * 1024)
+
+
+def warm_up(cache: AudioCache, texts: Iterable[str], voice: str, rate: str) -> int:
+    """Pre-render ``texts`` into the cache; returns how many were synthesized."""
+    from .aio import run_async
+    from .tts import synthesize_speech
+
+    rendered = 0
+    for text in texts:
+        key = audio_key(text, voice, rate)
+        if cache.contains(key):
+            continue
+        cache.put(key, run_async(synthesize_speech(preprocess_text(text), voice, rate)))
+        rendered += 1
+    return rendered
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the TTS audio cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm", help="Pre-render the canned fallback replies")
+    warm.add_argument("module", help="Module exposing FALLBACK_RESPONSES, e.g. server.cv_data")
+    args = parser.parse_args(argv)
+
+    from .tts import EDGE_RATE, EDGE_VOICE
+
+    cache = create_audio_cache()
+    if cache is None:
+        print("Audio cache is disabled (TTS_CACHE_MAX_MB=0)")
+        return 1
+
+    from .text import split_sentences
+
+    app_module = importlib.import_module(args.module)
+    replies = [reply for _keywords, reply in app_module.FALLBACK_RESPONSES]
+    replies.append(app_module.DEFAULT_FALLBACK_RESPONSE)
+    # Whole replies for /api/voice, single sentences for the streamed routes
+    texts = list(dict.fromkeys(text for reply in replies for text in [reply, *split_sentences(reply)]))
+    rendered = warm_up(cache, texts, EDGE_VOICE, EDGE_RATE)
+    print(f"Rendered {rendered} of {len(texts)} clips for {len(replies)} replies into {cache.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
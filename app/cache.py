@@ -0,0 +1,196 @@
+"""Response cache for chat replies.
+
+Replies are keyed on a normalized form of the visitor's message together
+with everything else that shapes the answer (system prompt, model and
+temperature), so a prompt or model change never serves stale replies.
+Two interchangeable backends are provided: an in-process LRU and a SQLite
+file that survives restarts and can be shared by several workers.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from .config import settings
+
+
+_WHITESPACE = re.compile(r"\s+")
+# Sentence punctuation at the end of a message; "c++", "c#" and ".net" keep theirs
+_TRAILING = re.compile(r"[\s.,;:!?…]+$")
+# A word, keeping the symbols that make names like c++, c#, .net or node.js
+_WORD = re.compile(r"\.?\w+(?:\.\w+)*[+#]*")
+
+
+def normalize_message(message: str) -> str:
+    """Fold case, spacing and closing punctuation so trivially different questions match."""
+    message = _WHITESPACE.sub(" ", message.lower()).strip()
+    return _TRAILING.sub("", message)
+
+
+def message_words(message: str) -> List[str]:
+    """The words of a message for matching, with "n't" spelled out as "not"."""
+    message = message.lower().replace("\u2019", "'").replace("n't", " not").replace("'s", "")
+    return _WORD.findall(message)
+
+
+def context_key(system: Optional[str], model: str, temperature: float) -> str:
+    """Hash of everything besides the message that shapes a reply."""
+    system_hash = hashlib.sha256((system or "").encode("utf-8")).hexdigest()
+    material = json.dumps([system_hash, model, temperature])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def make_key(message: str, system: Optional[str], model: str, temperature: float) -> str:
+    material = json.dumps([normalize_message(message), context_key(system, model, temperature)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """On-disk LRU with a per-entry TTL, stored in a single SQLite table."""
+
+    def __init__(self, path: str, max_entries: int, ttl: float) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if now - stored_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            # Drop expired rows, then the least recently used beyond capacity
+            self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """Backend-agnostic front end that keeps hit/miss counters."""
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.backend.set(key, value)
+
+    def get_or_generate(
+        self,
+        key: str,
+        generate: Callable[[], str],
+        should_cache: Callable[[str], bool] = bool,
+    ) -> str:
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = generate()
+        if should_cache(value):
+            self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+
+
+def create_response_cache() -> Optional[ResponseCache]:
+    """Build the cache configured in settings, or None when caching is off."""
+    backend = settings.chat_cache_backend.lower()
+    if backend == "memory":
+        return ResponseCache(MemoryBackend(settings.chat_cache_max_entries, settings.chat_cache_ttl))
+    if backend == "sqlite":
+        return ResponseCache(
+            SQLiteBackend(settings.chat_cache_path, settings.chat_cache_max_entries, settings.chat_cache_ttl)
+        )
+    return None
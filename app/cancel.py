@@ -0,0 +1,91 @@
+"""Cooperative cancellation for in-flight replies.
+
+A :class:`CancelToken` is created per turn and passed to LLM generation,
+speech synthesis and playback. When the user barges in, ``cancel()`` runs
+the callbacks those stages registered (closing the upstream HTTP response,
+cancelling the synthesis future, stopping the mixer), so work stops
+immediately instead of at the next poll, and the worker is free for the
+new question.
+"""
+
+import threading
+from typing import Callable, Optional
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._callbacks: list = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cancel callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancellation (now, if already cancelled).
+
+        Returns a function that unregisters it once the guarded work is done.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep up to ``timeout`` seconds; returns True as soon as cancelled."""
+        return self._event.wait(timeout)
+
+
+def cancelled(token: Optional[CancelToken]) -> bool:
+    return token is not None and token.cancelled
+
+
+class SessionTokens:
+    """Cancel tokens of the work in flight, keyed by Socket.IO session id or
+    by the reply id a page sends with the HTTP requests of one turn."""
+
+    def __init__(self) -> None:
+        self._tokens: dict = {}
+        self._lock = threading.Lock()
+
+    def begin(self, sid: str) -> CancelToken:
+        token = CancelToken()
+        with self._lock:
+            self._tokens.setdefault(sid, set()).add(token)
+        return token
+
+    def end(self, sid: str, token: CancelToken) -> None:
+        with self._lock:
+            tokens = self._tokens.get(sid)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens[sid]
+
+    def cancel(self, sid: str) -> int:
+        """Cancel everything running for ``sid``; returns how many were cancelled."""
+        with self._lock:
+            tokens = self._tokens.pop(sid, set())
+        for token in tokens:
+            token.cancel()
+        return len(tokens)
@@ -5,11 +5,71 @@ from dataclasses import dataclass
 @dataclass
 class Settings:
     whisper_model: str = os.getenv("WHISPER_MODEL", "small")
+    whisper_compute_type: str = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # int8 for CPU speed
+    whisper_device: str = os.getenv("WHISPER_DEVICE", "cpu")
+    whisper_cpu_threads: int = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # 0 lets CTranslate2 decide
+    whisper_eager_load: bool = os.getenv("WHISPER_EAGER_LOAD", "false").lower() == "true"
+    # Transcription worker pool: concurrent inferences and queued uploads beyond them
+    stt_workers: int = int(os.getenv("STT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+    stt_queue_size: int = int(os.getenv("STT_QUEUE_SIZE", "16"))
+    # Micro-batching: clips arriving within the window share one model call (0 disables)
+    stt_batch_window_ms: float = float(os.getenv("STT_BATCH_WINDOW_MS", "0"))
+    stt_batch_size: int = int(os.getenv("STT_BATCH_SIZE", "8"))
+    # Live transcription of Socket.IO audio streams (seconds; a partial interval of 0 sends finals only)
+    stream_partial_interval: float = float(os.getenv("STREAM_PARTIAL_INTERVAL", "1.0"))
+    stream_end_silence: float = float(os.getenv("STREAM_END_SILENCE", "0.6"))
+    stream_max_segment: float = float(os.getenv("STREAM_MAX_SEGMENT", "25"))
     use_vad: bool = os.getenv("USE_VAD", "true").lower() == "true"
+    # Web server profile (local, cloud, free, railway, railway_ai, voice); the
+    # provider overrides replace the profile's choice when set
+    server_profile: str = os.getenv("JARVIS_PROFILE", "local")
+    server_llm: str = os.getenv("JARVIS_LLM", "")
+    server_stt: str = os.getenv("JARVIS_STT", "")
+    server_tts: str = os.getenv("JARVIS_TTS", "")
+    secret_key: str = os.getenv("SECRET_KEY", "cv-jarvis-secret-key")
+    # threading for the development server; gunicorn.conf.py sets gevent for gevent workers
+    socketio_async_mode: str = os.getenv("SOCKETIO_ASYNC_MODE", "threading")
+    openai_chat_model: str = os.getenv("OPENAI_CHAT_MODEL", "gpt-3.5-turbo")
+    hf_chat_model: str = os.getenv("HF_CHAT_MODEL", "microsoft/DialoGPT-medium")
+    # Hosted models get the CV facts most relevant to each question instead of the whole CV
+    prompt_retrieval: bool = os.getenv("PROMPT_RETRIEVAL", "true").lower() == "true"
+    prompt_top_k: int = int(os.getenv("PROMPT_TOP_K", "4"))
     ollama_base_url: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     ollama_model: str = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+    # How long Ollama keeps the model (and the evaluated system prompt) loaded
+    # after a request: a duration like "30m", or seconds with -1 for forever
+    ollama_keep_alive: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    ollama_preload: bool = os.getenv("OLLAMA_PRELOAD", "true").lower() == "true"
     voice_rate: int = int(os.getenv("VOICE_RATE", "180"))
     voice_volume: float = float(os.getenv("VOICE_VOLUME", "1.0"))
+    # Shared upstream HTTP client (Ollama, OpenAI, Hugging Face)
+    upstream_pool_hosts: int = int(os.getenv("UPSTREAM_POOL_HOSTS", "4"))
+    upstream_pool_size: int = int(os.getenv("UPSTREAM_POOL_SIZE", "16"))
+    # Concurrent requests on the async client (chat completions); each waits as a coroutine
+    upstream_async_connections: int = int(os.getenv("UPSTREAM_ASYNC_CONNECTIONS", "200"))
+    upstream_connect_timeout: float = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5"))
+    upstream_read_timeout: float = float(os.getenv("UPSTREAM_READ_TIMEOUT", "30"))
+    upstream_retries: int = int(os.getenv("UPSTREAM_RETRIES", "2"))
+    upstream_backoff: float = float(os.getenv("UPSTREAM_BACKOFF", "0.3"))
+    # Chat response cache: "memory", "sqlite" or "off"
+    chat_cache_backend: str = os.getenv("CHAT_CACHE_BACKEND", "memory")
+    chat_cache_path: str = os.getenv("CHAT_CACHE_PATH", "chat_cache.sqlite3")
+    chat_cache_max_entries: int = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "512"))
+    chat_cache_ttl: float = float(os.getenv("CHAT_CACHE_TTL", "86400"))
+    # Semantic cache for paraphrased questions (off by default)
+    semantic_cache_enabled: bool = os.getenv("SEMANTIC_CACHE", "false").lower() == "true"
+    semantic_cache_embedder: str = os.getenv("SEMANTIC_CACHE_EMBEDDER", "hashing")
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.65"))
+    semantic_cache_max_entries: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1024"))
+    # On-disk cache of synthesized speech; 0 MB disables it
+    tts_cache_dir: str = os.getenv("TTS_CACHE_DIR", ".tts_cache")
+    tts_cache_max_mb: int = int(os.getenv("TTS_CACHE_MAX_MB", "200"))
+    # Speech backends probed at start-up and ranked by latency; failures cool down (seconds)
+    tts_backends: str = os.getenv("TTS_BACKENDS", "edge,festival,pyttsx3")
+    tts_probe_timeout: float = float(os.getenv("TTS_PROBE_TIMEOUT", "5"))
+    tts_breaker_cooldown: float = float(os.getenv("TTS_BREAKER_COOLDOWN", "30"))
+    # Port of the long-running festival --server (reused if one is already listening)
+    festival_port: int = int(os.getenv("FESTIVAL_PORT", "1314"))
 
 
 settings = Settings()
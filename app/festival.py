@@ -0,0 +1,194 @@
+"""Client for a long-running ``festival --server``.
+
+Spawning ``festival --tts`` per reply pays for process start-up and voice
+loading every time. Instead one server is started (or an already running
+one on the configured port is reused) and utterances are sent over its
+socket. The server answers each command with a sequence of messages:
+
+* ``WV`` followed by a waveform, terminated by :data:`STUFF_KEY`
+* ``LP`` followed by a Lisp value, terminated by :data:`STUFF_KEY`
+* ``ER`` when the command failed
+* ``OK`` when the command is complete
+
+Before every request the client checks that the process is alive, and a
+request that fails on a broken connection, or gets no reply within
+``request_timeout``, restarts the server and is retried once.
+"""
+
+import socket
+import subprocess
+import threading
+import time
+from typing import List, Optional
+
+
+STUFF_KEY = b"ft_StUfF_key"
+# A literal key inside a payload is sent with an X before its last byte
+_STUFFED = STUFF_KEY[:-1] + b"X"
+
+
+class FestivalError(RuntimeError):
+    pass
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class FestivalServer:
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 1314,
+        start_timeout: float = 10.0,
+        restart_delay: float = 30.0,
+        request_timeout: float = 30.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.start_timeout = start_timeout
+        self.restart_delay = restart_delay
+        self.request_timeout = request_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._sock: Optional[socket.socket] = None
+        self._buffer = b""
+        self._lock = threading.Lock()
+        self._failed_at = 0.0
+        self.restarts = 0
+
+    def _connect(self) -> socket.socket:
+        return socket.create_connection((self.host, self.port), timeout=self.start_timeout)
+
+    def _start(self) -> None:
+        """Connect to a server on the port, spawning one first if nothing is listening."""
+        try:
+            sock = self._connect()
+        except OSError:
+            self._process = subprocess.Popen(
+                ["festival", f"(set! server_port {self.port})", "--server"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            deadline = time.monotonic() + self.start_timeout
+            while True:
+                try:
+                    sock = self._connect()
+                    break
+                except OSError:
+                    if self._process.poll() is not None:
+                        raise FestivalError(f"festival --server exited with {self._process.returncode}")
+                    if time.monotonic() > deadline:
+                        raise FestivalError("festival --server did not start listening in time")
+                    time.sleep(0.1)
+        # Long enough for a paragraph of speech; a hung server raises socket.timeout
+        sock.settimeout(self.request_timeout)
+        self._sock = sock
+        self._buffer = b""
+        # Have synthesized waveforms sent back to us as RIFF (WAV) data
+        self._command("(tts_return_to_client)")
+        self._command("(Parameter.set 'Wavefiletype 'riff)")
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        self._buffer = b""
+
+    def _stop_process(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+    def _alive(self) -> bool:
+        if self._sock is None:
+            return False
+        # A server we spawned ourselves must still be running
+        return self._process is None or self._process.poll() is None
+
+    def _ensure_running(self) -> None:
+        if self._alive():
+            return
+        if self._sock is not None:
+            print("Festival server died, restarting")
+            self.restarts += 1
+        self._disconnect()
+        self._stop_process()
+        if self._failed_at and time.monotonic() - self._failed_at < self.restart_delay:
+            raise FestivalError("festival server unavailable")
+        try:
+            self._start()
+            self._failed_at = 0.0
+        except Exception:
+            self._failed_at = time.monotonic()
+            self._disconnect()
+            self._stop_process()
+            raise
+
+    def _read_until(self, marker: bytes) -> bytes:
+        while marker not in self._buffer:
+            chunk = self._sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("festival server closed the connection")
+            self._buffer += chunk
+        data, _, self._buffer = self._buffer.partition(marker)
+        return data
+
+    def _command(self, expr: str) -> List[bytes]:
+        """Send one Scheme expression and return the waveforms it produced."""
+        self._sock.sendall(expr.encode() + b"\n")
+        waves = []
+        while True:
+            kind = self._read_until(b"\n")
+            if kind == b"WV":
+                waves.append(self._read_until(STUFF_KEY).replace(_STUFFED, STUFF_KEY[:-1]))
+            elif kind == b"LP":
+                self._read_until(STUFF_KEY)
+            elif kind == b"ER":
+                raise FestivalError(f"festival rejected {expr[:60]!r}")
+            elif kind == b"OK":
+                return waves
+            else:
+                raise FestivalError(f"unexpected festival reply {kind[:20]!r}")
+
+    def _request(self, expr: str) -> List[bytes]:
+        with self._lock:
+            for attempt in (1, 2):
+                self._ensure_running()
+                try:
+                    return self._command(expr)
+                except OSError as e:
+                    # Broken or stalled connection (socket.timeout is an
+                    # OSError): restart the server and retry once
+                    print(f"Festival connection lost ({e}), restarting")
+                    self.restarts += 1
+                    self._disconnect()
+                    if attempt == 2:
+                        raise FestivalError(f"festival connection failed: {e}") from e
+        return []
+
+    def synthesize(self, text: str) -> List[bytes]:
+        """Synthesize ``text`` and return one WAV file per utterance."""
+        return self._request(f"(tts_textall {_quote(text)} \"nil\")")
+
+    def healthy(self) -> bool:
+        """Ping the server, restarting it if it has crashed."""
+        try:
+            self._request("(+ 1 1)")
+            return True
+        except Exception as e:
+            print(f"Festival health check failed: {e}")
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+            self._stop_process()
+
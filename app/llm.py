@@ -1,19 +1,37 @@
-from typing import Optional
-import requests
+import concurrent.futures
+import json
+from typing import AsyncIterator, Iterator, Optional
 
+from . import upstream
+from .aio import get_worker, iterate_async, run_async
+from .cancel import CancelToken, cancelled
 from .config import settings
 
 
-def generate_response(prompt: str, system: Optional[str] = None, temperature: float = 0.4, max_tokens: int = 200) -> str:
-    base_url = settings.ollama_base_url.rstrip("/")
-    model = settings.ollama_model
-    url = f"{base_url}/api/generate"
+FALLBACK_REPLY = (
+    "[local-fallback] I am online, but the local LLM endpoint is not responding. "
+    "Please ensure Ollama is running and the model is available."
+)
 
-    full_prompt = prompt if system is None else f"<|system|>\n{system}\n<|user|>\n{prompt}"
 
-    payload = {
-        "model": model,
-        "prompt": full_prompt,
+def _keep_alive():
+    """OLLAMA_KEEP_ALIVE as Ollama expects it: a duration string, or seconds (-1 = forever)"""
+    value = settings.ollama_keep_alive.strip()
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def _messages(prompt: str, system: Optional[str]) -> list:
+    # The system prompt is identical across requests and comes first, so Ollama
+    # reuses its evaluated KV cache and only evaluates the user turn
+    messages = [] if system is None else [{"role": "system", "content": system}]
+    return messages + [{"role": "user", "content": prompt}]
+
+
+def _build_payload(prompt: str, system: Optional[str], temperature: float, max_tokens: int, stream: bool) -> dict:
+    return {
+        "model": settings.ollama_model,
+        "messages": _messages(prompt, system),
+        "keep_alive": _keep_alive(),
         "options": {
             "temperature": temperature,
             "num_predict": max_tokens,
@@ -21,19 +39,138 @@ def generate_response(prompt: str, system: Optional[str] = None, temperature: fl
             "repeat_penalty": 1.1,
             "stop": ["\n\n", "User:", "Human:"],
         },
-        "stream": False,
+        "stream": stream,
     }
 
+
+def _chat_url() -> str:
+    return f"{settings.ollama_base_url.rstrip('/')}/api/chat"
+
+
+def _content(data: dict) -> str:
+    return (data.get("message") or {}).get("content") or ""
+
+
+async def agenerate_response(
+    prompt: str,
+    system: Optional[str] = None,
+    temperature: float = 0.4,
+    max_tokens: int = 200,
+) -> str:
+    """Return the whole reply, or the fallback if Ollama is unreachable."""
+    payload = _build_payload(prompt, system, temperature, max_tokens, stream=False)
+
     try:
-        resp = requests.post(url, json=payload, timeout=30)
+        resp = await upstream.apost(_chat_url(), json=payload)
         resp.raise_for_status()
-        data = resp.json()
-        text = data.get("response") or data.get("message") or ""
+        text = _content(resp.json())
         if not text:
             text = "I could not generate a response just now."
         return text.strip()
     except Exception:
-        return (
-            "[local-fallback] I am online, but the local LLM endpoint is not responding. "
-            "Please ensure Ollama is running and the model is available."
-        )
+        return FALLBACK_REPLY
+
+
+async def astream_response(
+    prompt: str,
+    system: Optional[str] = None,
+    temperature: float = 0.4,
+    max_tokens: int = 200,
+) -> AsyncIterator[str]:
+    """Yield response tokens as Ollama produces them.
+
+    Ollama streams one JSON object per line; each carries the next piece of
+    text in ``message.content`` and the last one has ``done`` set. If the endpoint is
+    unreachable before anything was produced, the fallback reply is yielded
+    instead so callers always get some text; if the stream breaks off after
+    that, :class:`~app.upstream.StreamInterrupted` is raised so the partial
+    reply is never taken for a complete one. Cancelling the consuming task
+    closes the upstream connection, which stops the generation.
+    """
+    payload = _build_payload(prompt, system, temperature, max_tokens, stream=True)
+
+    produced = False
+    try:
+        resp = await upstream.apost(_chat_url(), stream=True, json=payload)
+        try:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                token = _content(data)
+                if token:
+                    # Match generate_response, which strips leading whitespace
+                    if not produced:
+                        token = token.lstrip()
+                        if not token:
+                            continue
+                    produced = True
+                    yield token
+                if data.get("done"):
+                    break
+            else:
+                raise upstream.StreamInterrupted("Ollama closed the stream before it was done")
+        finally:
+            await resp.aclose()
+    except Exception as exc:
+        if produced:
+            raise upstream.StreamInterrupted(f"Ollama stream interrupted: {exc}") from exc
+        yield FALLBACK_REPLY
+        return
+
+    if not produced:
+        yield "I could not generate a response just now."
+
+
+def generate_response(
+    prompt: str,
+    system: Optional[str] = None,
+    temperature: float = 0.4,
+    max_tokens: int = 200,
+    cancel: Optional[CancelToken] = None,
+) -> str:
+    """Blocking form of :func:`agenerate_response`; an empty string if ``cancel`` fired first."""
+    try:
+        return run_async(agenerate_response(prompt, system, temperature, max_tokens), cancel=cancel)
+    except concurrent.futures.CancelledError:
+        if cancelled(cancel):
+            return ""
+        raise
+
+
+def stream_response(
+    prompt: str,
+    system: Optional[str] = None,
+    temperature: float = 0.4,
+    max_tokens: int = 200,
+    cancel: Optional[CancelToken] = None,
+) -> Iterator[str]:
+    """Blocking iterator over :func:`astream_response`; ``cancel`` ends it without a fallback."""
+    return iterate_async(astream_response(prompt, system, temperature, max_tokens), cancel=cancel)
+
+
+async def apreload_model(system: Optional[str] = None) -> Optional[dict]:
+    """Load the model and evaluate ``system`` so the first visitor skips both.
+
+    Returns Ollama's timings, or None if the endpoint is unreachable.
+    """
+    payload = _build_payload("Hello", system, 0.0, 1, stream=False)
+    try:
+        resp = await upstream.apost(_chat_url(), json=payload, timeout=None)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as exc:
+        print(f"Ollama preload failed ({exc})")
+        return None
+    print(
+        f"Ollama model {settings.ollama_model} ready "
+        f"(load {data.get('load_duration', 0) / 1e9:.1f}s, "
+        f"prompt {data.get('prompt_eval_count', 0)} tokens in {data.get('prompt_eval_duration', 0) / 1e9:.2f}s)"
+    )
+    return data
+
+
+def preload_in_background(system: Optional[str] = None) -> "concurrent.futures.Future":
+    """Start :func:`apreload_model` on the async worker without waiting for it."""
+    return get_worker().submit(apreload_model(system))
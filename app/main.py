@@ -2,7 +2,8 @@ import argparse
 import sys
 
 from .config import settings
-from .llm import generate_response
+from .llm import generate_response, preload_in_background
+from .pipeline import ConversationPipeline
 from .stt import STT
 from .tts import TTS
 
@@ -17,7 +18,11 @@ JARVIS_SYSTEM = (
 
 
 def run_text_mode() -> int:
+    if settings.ollama_preload:
+        preload_in_background(JARVIS_SYSTEM)
     tts = TTS()
+    # Rank the speech backends while the user types the first question
+    tts.probe_backends(wait=False)
     print("Mini Jarvis (text mode). Type your message. Ctrl+C or empty line to exit.\n")
     while True:
         try:
@@ -38,16 +43,25 @@ def run_text_mode() -> int:
 
 
 def run_audio_mode() -> int:
+    if settings.ollama_preload:
+        preload_in_background(JARVIS_SYSTEM)
     stt = STT()
     tts = TTS()
+    tts.probe_backends(wait=False)
+    # STT, LLM, TTS and playback run as queued stages, so the reply starts
+    # playing after its first sentence and the next recording can start at once
+    pipeline = ConversationPipeline(stt, tts, system=JARVIS_SYSTEM)
+    pipeline.start()
     
-    print("Mini Jarvis (audio mode). Press Enter to start recording, Enter again to stop.")
+    print("Mini Jarvis (audio mode). Press Enter to start recording; a pause in speech stops it.")
     print("Ctrl+C to exit.\n")
     
     while True:
         try:
             input("Press Enter to start recording...")
-            print("Recording... (press Enter to stop)")
+            # New input barges in: stop the reply still being generated or spoken
+            pipeline.interrupt()
+            print("Recording...")
             
             # Record audio
             audio = stt.record_with_vad()
@@ -55,22 +69,9 @@ def run_audio_mode() -> int:
             if len(audio) == 0:
                 print("No audio recorded. Try again.")
                 continue
-                
-            print("Transcribing...")
-            transcript = stt.transcribe_buffer(audio, stt.sample_rate)
             
-            if not transcript.strip():
-                print("No speech detected. Try again.")
-                continue
-                
-            print(f"You: {transcript}")
-            
-            # Generate response
-            reply = generate_response(transcript, system=JARVIS_SYSTEM)
-            print(f"Jarvis: {reply}")
-            
-            # Speak response
-            tts.say(reply)
+            # Transcription, reply and speech continue in the background
+            pipeline.submit_audio(audio)
             
         except KeyboardInterrupt:
             print("\nGoodbye!")
@@ -79,6 +80,7 @@ def run_audio_mode() -> int:
             print(f"Error: {e}")
             print("Continuing...")
     
+    pipeline.stop(wait=False)
     return 0
 
 
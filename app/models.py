@@ -0,0 +1,117 @@
+"""Process-wide registry of loaded Whisper models.
+
+Models are keyed by ``(size, compute_type, device, cpu_threads)`` and
+loaded at most once per process, however many :class:`~app.stt.STT`
+instances or threads ask for them. Servers can load and warm the default
+model at start-up with :func:`preload_in_background` and report
+:func:`is_ready` from a readiness endpoint, so traffic is only routed to
+an instance once the first transcription will be fast.
+"""
+
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from .config import settings
+
+
+_models: dict = {}
+_key_locks: dict = {}
+_registry_lock = threading.Lock()
+
+_ready = threading.Event()
+_state = {"status": "idle", "error": None, "load_seconds": None}
+
+
+def default_key() -> tuple:
+    return (
+        settings.whisper_model,
+        settings.whisper_compute_type,
+        settings.whisper_device,
+        settings.whisper_cpu_threads,
+    )
+
+
+def get_whisper_model(key: Optional[tuple] = None):
+    """Return the shared model for ``key`` (default: from settings), loading it once."""
+    key = key or default_key()
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        lock = _key_locks.setdefault(key, threading.Lock())
+    # Per-key lock: concurrent first requests wait for one load instead of each loading a copy
+    with lock:
+        model = _models.get(key)
+        if model is None:
+            try:
+                from faster_whisper import WhisperModel  # type: ignore
+            except Exception as exc:  # pragma: no cover
+                raise RuntimeError(
+                    "faster-whisper is not installed. Install requirements or use --text mode."
+                ) from exc
+            size, compute_type, device, cpu_threads = key
+            model = WhisperModel(
+                size,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                # One CTranslate2 worker per scheduler thread so their inferences run in parallel
+                num_workers=settings.stt_workers,
+            )
+            _models[key] = model
+    return model
+
+
+def warm_up(model, sample_rate: int = 16000) -> None:
+    """Run one inference on a second of silence so the first real request is hot."""
+    segments, _info = model.transcribe(np.zeros(sample_rate, dtype=np.float32), language="en")
+    # Segments are generated lazily; consume them to actually run the decoder
+    for _segment in segments:
+        pass
+
+
+def preload(key: Optional[tuple] = None) -> None:
+    """Load and warm the model for ``key``, then mark the registry ready."""
+    _state.update(status="loading", error=None)
+    start = time.perf_counter()
+    try:
+        warm_up(get_whisper_model(key))
+    except Exception as exc:
+        _state.update(status="failed", error=str(exc))
+        raise
+    _state.update(status="ready", load_seconds=round(time.perf_counter() - start, 2))
+    _ready.set()
+
+
+def preload_in_background(key: Optional[tuple] = None) -> threading.Thread:
+    _state.update(status="loading")
+
+    def run():
+        try:
+            preload(key)
+        except Exception as exc:
+            print(f"Whisper preload failed: {exc}")
+
+    thread = threading.Thread(target=run, name="whisper-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def wait_ready(timeout: Optional[float] = None) -> bool:
+    return _ready.wait(timeout)
+
+
+def status() -> dict:
+    return {
+        "ready": is_ready(),
+        **_state,
+        "models": ["/".join(str(part) for part in key) for key in _models],
+    }
@@ -0,0 +1,196 @@
+"""Pipelined conversation engine for the CLI audio mode.
+
+Each stage runs on its own thread and hands work to the next through a
+queue::
+
+    audio -> [STT] -> transcript -> [LLM] -> sentences -> [TTS] -> clips -> [playback]
+
+The LLM stage streams tokens through a :class:`~app.text.SentenceChunker`,
+so the first sentence is being synthesized and played while the rest of
+the reply is still being generated, and the caller can record the next
+question as soon as it has submitted the previous one. Reply latency is
+roughly the time to the first sentence rather than to the whole answer.
+
+Every turn carries the :class:`~app.cancel.CancelToken` that was current
+when it was submitted. :meth:`ConversationPipeline.interrupt` cancels it,
+which aborts the LLM request, synthesis and playback in flight, and the
+stages skip whatever is still queued for that turn.
+"""
+
+import queue
+import threading
+from typing import Optional
+
+from .cancel import CancelToken
+from .llm import stream_response
+from .text import SentenceChunker
+from .tts_backends import Clip
+
+
+# Sentinels passed down the queues
+_STOP = object()
+_END_OF_TURN = object()
+
+
+class ConversationPipeline:
+    def __init__(self, stt, tts, system: Optional[str] = None, render_ahead: int = 2) -> None:
+        self.stt = stt
+        self.tts = tts
+        self.system = system
+        self._audio: queue.Queue = queue.Queue()
+        self._prompts: queue.Queue = queue.Queue()
+        self._sentences: queue.Queue = queue.Queue()
+        # Bounded so synthesis stays at most a couple of sentences ahead of playback
+        self._clips: queue.Queue = queue.Queue(maxsize=render_ahead)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._cancel = CancelToken()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._threads = [
+            threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            for name, target in (
+                ("stt", self._stt_stage),
+                ("llm", self._llm_stage),
+                ("tts", self._tts_stage),
+                ("playback", self._playback_stage),
+            )
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def _turn_started(self) -> None:
+        with self._lock:
+            self._pending += 1
+            self._idle.clear()
+
+    def _turn_done(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.set()
+
+    def submit_audio(self, audio) -> None:
+        """Queue a recorded utterance; returns immediately."""
+        self._turn_started()
+        self._audio.put((self._cancel, audio))
+
+    def submit_text(self, text: str) -> None:
+        """Queue a typed question, skipping the STT stage."""
+        self._turn_started()
+        self._prompts.put((self._cancel, text))
+
+    def interrupt(self) -> None:
+        """Barge in: stop every turn submitted so far, including the one playing."""
+        with self._lock:
+            token, self._cancel = self._cancel, CancelToken()
+        token.cancel()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted turn has finished playing."""
+        return self._idle.wait(timeout)
+
+    def stop(self, wait: bool = True) -> None:
+        self._audio.put(_STOP)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _stt_stage(self) -> None:
+        while True:
+            item = self._audio.get()
+            if item is _STOP:
+                self._prompts.put(_STOP)
+                return
+            token, audio = item
+            if token.cancelled:
+                self._turn_done()
+                continue
+            try:
+                transcript = self.stt.transcribe_buffer(audio, self.stt.sample_rate)
+            except Exception as e:
+                print(f"Transcription error: {e}")
+                transcript = ""
+            if not transcript.strip() or token.cancelled:
+                if not token.cancelled:
+                    print("No speech detected. Try again.")
+                self._turn_done()
+                continue
+            print(f"You: {transcript}")
+            self._prompts.put((token, transcript))
+
+    def _llm_stage(self) -> None:
+        while True:
+            item = self._prompts.get()
+            if item is _STOP:
+                self._sentences.put(_STOP)
+                return
+            token, prompt = item
+            chunker = SentenceChunker()
+            try:
+                if token.cancelled:
+                    continue
+                print("Jarvis: ", end="", flush=True)
+                for text in stream_response(prompt, system=self.system, cancel=token):
+                    print(text, end="", flush=True)
+                    for sentence in chunker.feed(text):
+                        self._sentences.put((token, sentence))
+                print()
+                rest = chunker.flush()
+                if rest and not token.cancelled:
+                    self._sentences.put((token, rest))
+            except Exception as e:
+                print(f"\nLLM error: {e}")
+            finally:
+                self._sentences.put((token, _END_OF_TURN))
+
+    def _tts_stage(self) -> None:
+        first = True
+        while True:
+            item = self._sentences.get()
+            if item is _STOP:
+                self._clips.put(_STOP)
+                return
+            token, sentence = item
+            if sentence is _END_OF_TURN:
+                self._clips.put(item)
+                first = True
+                continue
+            if token.cancelled:
+                continue
+            # Jarvis-style phrasing only applies to the opening of a reply
+            audio = self.tts.render(sentence, preprocess=first, cancel=token)
+            first = False
+            # Without rendered audio, playback speaks the text through a direct backend
+            self._clips.put((token, audio if audio is not None else sentence))
+
+    def _playback_stage(self) -> None:
+        playing = None  # clip the playback engine is currently working through
+        while True:
+            item = self._clips.get()
+            if item is _STOP:
+                self.tts.wait_played(playing)
+                return
+            token, clip = item
+            if clip is _END_OF_TURN:
+                self.tts.wait_played(playing)
+                playing = None
+                self._turn_done()
+                continue
+            if token.cancelled:
+                continue
+            try:
+                # Queue this clip before the previous one ends so sentences play gaplessly
+                queued = self.tts.queue_audio(clip.data, token, clip.format) if isinstance(clip, Clip) else None
+                self.tts.wait_played(playing)
+                playing = queued
+                if queued is not None:
+                    continue
+                if isinstance(clip, Clip):
+                    self.tts.play(clip.data, token, clip.format)
+                else:
+                    self.tts.speak(clip, token)
+            except Exception as e:
+                print(f"Playback error: {e}")
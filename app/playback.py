@@ -0,0 +1,144 @@
+"""In-memory audio playback through a callback-driven output stream.
+
+MP3 clips from edge-tts (and WAV from Festival) are decoded with PyAV straight from bytes into
+float32 PCM and appended to a queue that the sounddevice output callback
+drains. The stream stays open between clips, so consecutive sentences
+play back to back without a gap, and each clip's ``Future`` resolves
+from the callback as soon as its last sample has been handed to the
+device, with no polling loop. Cancelling a clip's future silences it at
+the next audio block.
+"""
+
+import io
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional
+
+import numpy as np
+
+
+SAMPLE_RATE = 24000  # edge-tts renders 24 kHz mono
+
+
+def decode_audio(data: bytes, sample_rate: int = SAMPLE_RATE, format: str = "mp3") -> np.ndarray:
+    """Decode an MP3 (or WAV) file held in memory to mono float32 samples at ``sample_rate``."""
+    import av  # type: ignore
+
+    chunks = []
+    with av.open(io.BytesIO(data), format=format) as container:
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=sample_rate)
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().reshape(-1))
+        # Drain the samples the resampler is still holding
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().reshape(-1))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32, copy=False)
+
+
+class PlaybackEngine:
+    def __init__(self, sample_rate: int = SAMPLE_RATE, blocksize: int = 512) -> None:
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self._clips: deque = deque()
+        self._current = None
+        self._pos = 0
+        self._lock = threading.Lock()
+        self._stream = None
+
+    def start(self) -> None:
+        """Open the output stream; raises if no audio device is available."""
+        if self._stream is not None:
+            return
+        import sounddevice as sd
+
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=self.blocksize,
+            callback=self._callback,
+        )
+        self._stream.start()
+
+    def enqueue(self, samples: np.ndarray) -> Future:
+        """Queue mono float32 samples behind any clips already playing."""
+        future: Future = Future()
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        if len(samples) == 0:
+            future.set_result(None)
+            return future
+        with self._lock:
+            self._clips.append((samples, future))
+        return future
+
+    def play_file(self, data: bytes, format: str = "mp3") -> Future:
+        return self.enqueue(decode_audio(data, self.sample_rate, format))
+
+    def _callback(self, outdata, frames, time_info, status) -> None:
+        out = outdata[:, 0]
+        filled = 0
+        finished = []
+        with self._lock:
+            while filled < frames:
+                if self._current is None or self._current[1].cancelled():
+                    if not self._clips:
+                        self._current = None
+                        break
+                    self._current = self._clips.popleft()
+                    self._pos = 0
+                    continue
+                clip, future = self._current
+                take = min(frames - filled, len(clip) - self._pos)
+                out[filled:filled + take] = clip[self._pos:self._pos + take]
+                filled += take
+                self._pos += take
+                if self._pos >= len(clip):
+                    finished.append(future)
+                    self._current = None
+        out[filled:] = 0
+        for future in finished:
+            if future.set_running_or_notify_cancel():
+                future.set_result(None)
+
+    def stop(self) -> None:
+        """Silence playback and drop every queued clip."""
+        with self._lock:
+            pending = list(self._clips)
+            if self._current is not None:
+                pending.append(self._current)
+            self._clips.clear()
+            self._current = None
+        for _samples, future in pending:
+            future.cancel()
+
+    def close(self) -> None:
+        self.stop()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+_engine: Optional[PlaybackEngine] = None
+_engine_failed = False
+_engine_lock = threading.Lock()
+
+
+def get_playback_engine() -> Optional[PlaybackEngine]:
+    """Return the shared engine, or None if PyAV, sounddevice or an output device is missing."""
+    global _engine, _engine_failed
+    with _engine_lock:
+        if _engine is None and not _engine_failed:
+            try:
+                import av  # type: ignore  # noqa: F401
+
+                engine = PlaybackEngine()
+                engine.start()
+                _engine = engine
+            except Exception as e:
+                print(f"Stream playback unavailable ({e}), using pygame")
+                _engine_failed = True
+        return _engine
@@ -0,0 +1,128 @@
+"""Polyphase sample-rate conversion for feeding audio to Whisper.
+
+Rates are converted by the rational factor ``up/down`` (e.g. 48 kHz -> 16 kHz
+is 1/3, 44.1 kHz -> 16 kHz is 160/441) through a Kaiser-windowed sinc
+low-pass filter, so content above the new Nyquist frequency is removed
+instead of aliasing into the speech band. The filter is split into ``up``
+phases and only the taps that line up with real input samples are
+evaluated, as strided matrix-vector products in float32.
+
+:class:`Resampler` keeps its filter history between calls, so a live
+stream can be fed block by block and produces the same output as
+resampling the whole signal at once.
+"""
+
+from functools import lru_cache
+from math import ceil, gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Below this many outputs per filter phase, looping over phases costs more
+# than gathering every output's input window at once.
+_MIN_OUTPUTS_PER_PHASE = 8
+
+
+@lru_cache(maxsize=16)
+def _design_filter(up: int, down: int, zero_crossings: int, rolloff: float, beta: float) -> tuple:
+    """Return ``(phases, half)`` where ``phases[p, -1 - k] = h[p + k * up]``."""
+    max_factor = max(up, down)
+    half = zero_crossings * max_factor
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    cutoff = rolloff / (2 * max_factor)  # in cycles per upsampled sample
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(len(n), beta)
+    h *= up / h.sum()  # unity DC gain after zero-stuffing by ``up``
+
+    taps = ceil(len(h) / up)
+    padded = np.zeros(taps * up)
+    padded[:len(h)] = h
+    # Reverse the taps so a window of input in time order can be dotted directly
+    phases = padded.reshape(taps, up).T[:, ::-1].astype(np.float32)
+    return np.ascontiguousarray(phases), half
+
+
+class Resampler:
+    def __init__(
+        self,
+        sr_in: int,
+        sr_out: int,
+        zero_crossings: int = 16,
+        rolloff: float = 0.94,
+        beta: float = 8.6,
+    ) -> None:
+        g = gcd(sr_in, sr_out)
+        self.sr_in = sr_in
+        self.sr_out = sr_out
+        self.up = sr_out // g
+        self.down = sr_in // g
+        self._phases, self._half = _design_filter(self.up, self.down, zero_crossings, rolloff, beta)
+        self._taps = self._phases.shape[1]
+        self._tap_offsets = np.arange(self._taps)
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.zeros(self._taps - 1, dtype=np.float32)
+        self._received = 0  # input samples seen so far
+        self._produced = 0  # output samples emitted so far
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample the next block of a stream; returns every output sample now computable."""
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if self.up == self.down:
+            self._received += len(block)
+            self._produced += len(block)
+            return block.copy()
+
+        buf = np.concatenate((self._history, block))
+        base = self._received - len(self._history)  # input index of buf[0]
+        self._received += len(block)
+        self._history = buf[len(buf) - len(self._history):]
+
+        # Output m is centred on upsampled time m * down, so it needs input
+        # up to (m * down + half) // up
+        last = (self._received * self.up - 1 - self._half) // self.down
+        if last < self._produced:
+            return np.zeros(0, dtype=np.float32)
+
+        windows = sliding_window_view(buf, self._taps)
+        out = np.empty(last - self._produced + 1, dtype=np.float32)
+        if len(out) >= _MIN_OUTPUTS_PER_PHASE * self.up:
+            # Outputs m, m + up, m + 2 * up, ... share a filter phase and their
+            # input windows start ``down`` samples apart, so each phase is one
+            # strided view of the buffer times one tap vector.
+            for r in range(self.up):
+                t = (self._produced + r) * self.down + self._half
+                first = t // self.up - base - (self._taps - 1)
+                count = len(range(r, len(out), self.up))
+                rows = windows[first:first + (count - 1) * self.down + 1:self.down]
+                out[r::self.up] = rows @ self._phases[t % self.up]
+        else:
+            # Small blocks of a live stream: gather each output's window and phase directly
+            t = np.arange(self._produced, last + 1) * self.down + self._half
+            rows = windows[t // self.up - base - (self._taps - 1)]
+            out[:] = np.einsum("ij,ij->i", rows, self._phases[t % self.up])
+        self._produced = last + 1
+        return out
+
+    def flush(self) -> np.ndarray:
+        """Emit the tail held back by the filter delay and reset the stream."""
+        expected = ceil(self._received * self.up / self.down)
+        missing = expected - self._produced
+        if missing <= 0 or self.up == self.down:
+            self.reset()
+            return np.zeros(0, dtype=np.float32)
+        t_last = (expected - 1) * self.down + self._half
+        pad = t_last // self.up - self._received + 1
+        tail = self.process(np.zeros(max(pad, 0), dtype=np.float32))[:missing]
+        self.reset()
+        return tail
+
+
+def resample(audio: np.ndarray, sr_in: int, sr_out: int) -> np.ndarray:
+    """Resample a whole signal; output length is ``ceil(len(audio) * sr_out / sr_in)``."""
+    if sr_in == sr_out:
+        return np.asarray(audio, dtype=np.float32)
+    resampler = Resampler(sr_in, sr_out)
+    head = resampler.process(audio)
+    return np.concatenate((head, resampler.flush()))
@@ -0,0 +1,115 @@
+"""Bounded worker pool for transcription jobs.
+
+Uploads are handed to a fixed set of worker threads through a bounded
+queue instead of running inside whichever request thread received them.
+At most ``workers`` inferences run at once, so a burst of voice clips
+queues up rather than oversubscribing the CPU, and once the queue is
+full :meth:`TranscriptionScheduler.submit` raises :class:`QueueFull` so
+the web layer can answer 503 with a ``Retry-After`` hint.
+
+faster-whisper releases the GIL inside CTranslate2, and the shared model
+is created with ``num_workers`` matching the pool size, so threads give
+real parallelism here without the memory cost of one model per process.
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from .config import settings
+
+
+class QueueFull(Exception):
+    """Raised when the transcription queue cannot take another job."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Transcription queue is full")
+        self.retry_after = retry_after
+
+
+class TranscriptionScheduler:
+    def __init__(self, workers: int, max_queue: int, name: str = "stt-worker") -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._waits: deque = deque(maxlen=256)
+        self._service_times: deque = deque(maxlen=256)
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            future, fn, args, kwargs, enqueued = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            with self._lock:
+                self._in_flight += 1
+                self._waits.append(started - enqueued)
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._completed += 1
+                    self._service_times.append(time.perf_counter() - started)
+
+    def retry_after(self) -> int:
+        """Seconds until a queued slot is likely to free up, for ``Retry-After``."""
+        with self._lock:
+            service = sum(self._service_times) / len(self._service_times) if self._service_times else 1.0
+        return max(1, math.ceil(service * (self._queue.qsize() + 1) / self.workers))
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((future, fn, args, kwargs, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise QueueFull(self.retry_after()) from None
+        return future
+
+    def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """Queue ``fn`` and block the caller until a worker has run it."""
+        return self.submit(fn, *args, **kwargs).result(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "workers": self.workers,
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_ms_avg": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                "wait_ms_p95": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1) if waits else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        for _thread in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+def create_transcription_scheduler() -> TranscriptionScheduler:
+    return TranscriptionScheduler(settings.stt_workers, settings.stt_queue_size)
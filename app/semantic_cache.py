@@ -0,0 +1,238 @@
+"""Semantic answer cache for paraphrased questions.
+
+Questions are embedded into fixed-size unit vectors and kept in a
+preallocated matrix per prompt context; a lookup is one matrix-vector
+product, so it stays well under a millisecond for the few hundred
+questions a CV site sees. When the closest earlier question clears the
+threshold its stored answer is returned instead of calling the LLM.
+Neither embedder reliably tells "should I hire him" from "why should I not
+hire him", "where" from "when", or Java from Python in otherwise identical
+questions. So a question only matches earlier questions of the same kind
+(both negated or neither, asking for the same place, time or person) that
+share at least one subject word.
+
+The default embedder hashes word and character n-gram features and needs
+nothing beyond NumPy. Setting ``SEMANTIC_CACHE_EMBEDDER`` to a
+sentence-transformers model name (e.g. ``all-MiniLM-L6-v2``) switches to a
+small local CPU embedding model instead.
+"""
+
+import threading
+import zlib
+from typing import Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional for the cloud apps
+    np = None
+
+from .cache import message_words
+from .config import settings
+
+
+# Words that carry no meaning for matching CV questions, including the
+# candidate's name which appears in almost every question
+STOPWORDS = frozenset(
+    "a an and andreas christodoulou are about at be can could did do does for from has have he him "
+    "his how i in is it s "
+    "me my of on or please say so tell than that the their them there this to was what when where "
+    "which who why will with would you your".split()
+)
+
+# Kept as features here (the CV index drops them); the last three ask for a
+# place, a time or a person, so questions must agree on those
+INTERROGATIVES = frozenset("how what which why where when who".split())
+_ANSWER_TYPES = frozenset("where when who".split())
+
+# Never stopwords: "not" flips the answer
+NEGATIONS = frozenset("not no never nor neither none nothing nobody without cannot".split())
+
+# Words that frame a question rather than name what it is about
+FRAME_WORDS = frozenset(
+    "experience experienced year years long many much know knows good strong skill skills work worked "
+    "working use used using role position job should we think any some most best level like".split()
+)
+
+_IGNORED = STOPWORDS - INTERROGATIVES
+
+
+def question_kind(text: str) -> tuple:
+    """(negated, place/time/person asked for); only questions of the same kind share answers."""
+    words = message_words(text)
+    return any(w in NEGATIONS for w in words), frozenset(w for w in words if w in _ANSWER_TYPES)
+
+
+def subject_words(text: str) -> frozenset:
+    """What a question is about: the words that are not stopwords, interrogatives, negations or framing."""
+    return frozenset(
+        w for w in message_words(text)
+        if w not in STOPWORDS and w not in INTERROGATIVES and w not in NEGATIONS and w not in FRAME_WORDS
+    )
+
+
+class HashingEmbedder:
+    """Hashed bag of word unigrams, bigrams and character trigrams.
+
+    Subject words weigh most, so two questions that only share their framing
+    ("how many years of experience with ...") stay apart.
+    """
+
+    def __init__(self, dim: int = 2048) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> list:
+        """(feature, weight) pairs; whole words outweigh character trigrams."""
+        words = [w for w in message_words(text) if w not in _IGNORED]
+        subjects = subject_words(text)
+        features = [(f"w:{w}", 4.0 if w in subjects else 2.0) for w in words]
+        features += [(f"b:{a} {b}", 1.0) for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [(f"c:{padded[i:i + 3]}", 0.5) for i in range(len(padded) - 2)]
+        return features
+
+    def embed(self, text: str) -> "np.ndarray":
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            # The top hash bit picks the sign so collisions tend to cancel out
+            vec[h % self.dim] += weight if h >> 31 else -weight
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+
+class SentenceTransformerEmbedder:
+    """Small local sentence-transformers model running on CPU."""
+
+    def __init__(self, model_name: str) -> None:
+        from sentence_transformers import SentenceTransformer  # type: ignore
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, text: str) -> "np.ndarray":
+        return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+
+class _Index:
+    """Fixed-capacity ring of unit vectors, their kinds, subjects and answers."""
+
+    def __init__(self, dim: int, capacity: int) -> None:
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.kinds: list = [None] * capacity
+        self.subjects: list = [frozenset()] * capacity
+        self.questions: list = [None] * capacity
+        self.answers: list = [None] * capacity
+        self.size = 0
+        self.cursor = 0
+
+    def search(self, vec: "np.ndarray", kind: tuple, subjects: frozenset, threshold: float) -> int:
+        """The closest entry above ``threshold`` of the same kind with a shared subject, or -1."""
+        if self.size == 0:
+            return -1
+        scores = self.vectors[:self.size] @ vec
+        candidates = np.flatnonzero(scores >= threshold)
+        for i in candidates[np.argsort(-scores[candidates])]:
+            if self.kinds[i] != kind:
+                continue
+            # Questions without subject words ("tell me more") match on score alone
+            if subjects & self.subjects[i] or not (subjects or self.subjects[i]):
+                return int(i)
+        return -1
+
+    def add(self, vec: "np.ndarray", kind: tuple, subjects: frozenset, question: str, answer: str) -> None:
+        # Once full, overwrite the oldest entry
+        slot = self.cursor
+        self.vectors[slot] = vec
+        self.kinds[slot] = kind
+        self.subjects[slot] = subjects
+        self.questions[slot] = question
+        self.answers[slot] = answer
+        self.cursor = (self.cursor + 1) % len(self.answers)
+        self.size = min(self.size + 1, len(self.answers))
+
+
+class SemanticCache:
+    def __init__(self, embedder, threshold: float = 0.65, max_entries: int = 1024) -> None:
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._indexes: dict = {}
+        self._lock = threading.Lock()
+
+    def _index(self, context: str) -> _Index:
+        index = self._indexes.get(context)
+        if index is None:
+            index = self._indexes[context] = _Index(self.embedder.dim, self.max_entries)
+        return index
+
+    def lookup(self, question: str, context: str = "") -> Optional[str]:
+        """Return the stored answer for the closest earlier question, if close enough."""
+        vec = self.embedder.embed(question)
+        with self._lock:
+            index = self._index(context)
+            best = index.search(vec, question_kind(question), subject_words(question), self.threshold)
+            if best >= 0:
+                self.hits += 1
+                return index.answers[best]
+            self.misses += 1
+            return None
+
+    def store(self, question: str, answer: str, context: str = "") -> None:
+        vec = self.embedder.embed(question)
+        with self._lock:
+            self._index(context).add(vec, question_kind(question), subject_words(question), question, answer)
+
+    def get_or_generate(
+        self,
+        question: str,
+        generate: Callable[[], str],
+        context: str = "",
+        should_cache: Callable[[str], bool] = bool,
+    ) -> str:
+        answer = self.lookup(question, context)
+        if answer is not None:
+            return answer
+        answer = generate()
+        if should_cache(answer):
+            self.store(question, answer, context)
+        return answer
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "embedder": type(self.embedder).__name__,
+                "threshold": self.threshold,
+                "entries": sum(index.size for index in self._indexes.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def create_embedder(name: str):
+    if name == "hashing":
+        return HashingEmbedder()
+    return SentenceTransformerEmbedder(name)
+
+
+def create_semantic_cache() -> Optional[SemanticCache]:
+    """Build the semantic cache configured in settings, or None when it is off."""
+    if not settings.semantic_cache_enabled:
+        return None
+    if np is None:
+        print("numpy not available, semantic cache disabled")
+        return None
+    try:
+        embedder = create_embedder(settings.semantic_cache_embedder)
+    except Exception as exc:
+        print(f"Semantic cache embedder unavailable ({exc}), falling back to hashing")
+        embedder = HashingEmbedder()
+    return SemanticCache(
+        embedder,
+        threshold=settings.semantic_cache_threshold,
+        max_entries=settings.semantic_cache_max_entries,
+    )
@@ -0,0 +1,415 @@
+"""Incremental speech-to-text for audio streamed over Socket.IO.
+
+The browser sends small, numbered blocks of 16-bit mono PCM as it
+records. Each socket gets a :class:`StreamingTranscriber` that cuts the stream into
+30 ms frames, classifies every frame with webrtcvad (or an energy
+threshold when webrtcvad is not installed) and collects speech into a
+preallocated :class:`RingBuffer`. While the user is talking, the segment
+so far is re-transcribed every ``partial_interval`` seconds and reported
+as a partial hypothesis; once the speaker pauses the segment is
+transcribed one last time and reported as final.
+
+Each stream hands its segments to a worker thread, and partial requests
+that pile up behind a slow transcription are coalesced, so the socket
+handler only ever does framing and VAD. The transcribe callable is
+expected to queue on the shared transcription scheduler, which bounds
+concurrent inference across all streams; when that queue is full a
+partial is skipped (the next one covers the same audio) and a final is
+retried a few times before it is given up.
+"""
+
+import io
+import queue
+import threading
+import time
+import wave
+from typing import Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional for the cloud apps
+    np = None
+
+from .config import settings
+from .scheduler import QueueFull
+
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30  # webrtcvad accepts 10, 20 or 30 ms frames
+FINAL_RETRIES = 3
+# Out-of-order blocks held per recording before a missing one is given up (~5 s)
+MAX_PENDING_BLOCKS = 50
+
+
+class RingBuffer:
+    """Fixed-capacity float32 buffer holding the most recent samples."""
+
+    def __init__(self, capacity: int) -> None:
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._start = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, samples: "np.ndarray") -> None:
+        """Append samples, overwriting the oldest ones once full."""
+        samples = samples[-self.capacity:]
+        n = len(samples)
+        end = (self._start + self._size) % self.capacity
+        first = min(n, self.capacity - end)
+        self._data[end:end + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        overflow = max(0, self._size + n - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def drop(self, n: int) -> None:
+        """Discard the ``n`` oldest samples."""
+        n = min(n, self._size)
+        self._start = (self._start + n) % self.capacity
+        self._size -= n
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def read(self) -> "np.ndarray":
+        """Copy of the buffered samples in time order."""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start:end].copy()
+        return np.concatenate((self._data[self._start:], self._data[:end - self.capacity]))
+
+
+class FrameClassifier:
+    """Speech/non-speech decision for one frame of float32 audio."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, aggressiveness: int = 2, energy_threshold: float = 0.01) -> None:
+        self.sample_rate = sample_rate
+        self.energy_threshold = energy_threshold
+        try:
+            import webrtcvad  # type: ignore
+            self._vad = webrtcvad.Vad(aggressiveness)
+        except ImportError:
+            self._vad = None
+        self._pcm = None
+
+    def is_speech(self, frame: "np.ndarray") -> bool:
+        if self._vad is None:
+            return float(np.sqrt(np.mean(frame * frame))) >= self.energy_threshold
+        if self._pcm is None or len(self._pcm) != len(frame):
+            self._pcm = np.empty(len(frame), dtype=np.int16)
+        np.multiply(np.clip(frame, -1.0, 1.0), 32767, out=self._pcm, casting="unsafe")
+        return self._vad.is_speech(self._pcm.tobytes(), self.sample_rate)
+
+
+class StreamingTranscriber:
+    def __init__(
+        self,
+        transcribe: Callable[["np.ndarray"], str],
+        on_partial: Callable[[str], None],
+        on_final: Callable[[str, bool], None],
+        input_rate: int = SAMPLE_RATE,
+        partial_interval: float = 1.0,
+        end_silence: float = 0.6,
+        max_segment: float = 25.0,
+        pre_roll: float = 0.3,
+    ) -> None:
+        self._transcribe = transcribe
+        self._on_partial = on_partial
+        self._on_final = on_final
+        self._frame_len = SAMPLE_RATE * FRAME_MS // 1000
+        self._frame = np.zeros(self._frame_len, dtype=np.float32)
+        self._filled = 0
+        self._classifier = FrameClassifier()
+        self._resampler = None
+        if input_rate != SAMPLE_RATE:
+            from .resample import Resampler
+            self._resampler = Resampler(input_rate, SAMPLE_RATE)
+
+        self._segment = RingBuffer(int(max_segment * SAMPLE_RATE))
+        self._pre_roll = int(pre_roll * SAMPLE_RATE)
+        self._partial_every = int(partial_interval * SAMPLE_RATE)  # 0: finals only
+        self._end_frames = max(1, int(end_silence * 1000 / FRAME_MS))
+        self._in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._since_partial = 0
+
+        self._jobs: queue.Queue = queue.Queue()
+        self._partial_pending = threading.Event()
+        self._worker = threading.Thread(target=self._work, name="stream-stt", daemon=True)
+        self._worker.start()
+
+    def feed(self, pcm) -> None:
+        """Add a block of int16 PCM bytes (or a float32 array) to the stream."""
+        if isinstance(pcm, (bytes, bytearray, memoryview)):
+            samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768
+        else:
+            samples = np.asarray(pcm, dtype=np.float32).reshape(-1)
+        if self._resampler is not None:
+            samples = self._resampler.process(samples)
+        self._feed_frames(samples)
+
+    def _feed_frames(self, samples: "np.ndarray") -> None:
+        pos = 0
+        while pos < len(samples):
+            take = min(self._frame_len - self._filled, len(samples) - pos)
+            self._frame[self._filled:self._filled + take] = samples[pos:pos + take]
+            self._filled += take
+            pos += take
+            if self._filled == self._frame_len:
+                self._filled = 0
+                self._process_frame(self._frame)
+
+    def _process_frame(self, frame: "np.ndarray") -> None:
+        speech = self._classifier.is_speech(frame)
+        self._segment.write(frame)
+
+        if not self._in_speech:
+            self._speech_run = self._speech_run + 1 if speech else 0
+            # Three speech frames in a row start a segment; clicks and pops do not
+            if self._speech_run >= 3:
+                self._in_speech = True
+                self._silence_run = 0
+                self._since_partial = 0
+            elif len(self._segment) > self._pre_roll:
+                # Keep a little audio before speech onset so the first word is not clipped
+                self._segment.drop(len(self._segment) - self._pre_roll)
+            return
+
+        self._silence_run = 0 if speech else self._silence_run + 1
+        self._since_partial += len(frame)
+        full = len(self._segment) >= self._segment.capacity - self._frame_len
+        if self._silence_run >= self._end_frames or full:
+            self._end_segment(done=False)
+        elif self._partial_every and self._since_partial >= self._partial_every:
+            self._since_partial = 0
+            if not self._partial_pending.is_set():
+                self._partial_pending.set()
+                self._jobs.put(("partial", self._segment.read(), False))
+
+    def _end_segment(self, done: bool) -> None:
+        audio = self._segment.read() if self._in_speech else None
+        self._segment.clear()
+        self._in_speech = False
+        self._speech_run = 0
+        if audio is not None or done:
+            self._jobs.put(("final", audio, done))
+
+    def finish(self) -> None:
+        """The client stopped recording: finalize whatever is buffered."""
+        if self._resampler is not None:
+            self._feed_frames(self._resampler.flush())
+        self._filled = 0
+        self._end_segment(done=True)
+
+    def close(self) -> None:
+        self._jobs.put(None)
+
+    def _run(self, kind: str, audio: "np.ndarray") -> str:
+        attempts = 0
+        while True:
+            try:
+                return self._transcribe(audio)
+            except QueueFull as exc:
+                if kind == "partial" or attempts >= FINAL_RETRIES:
+                    raise
+                attempts += 1
+                time.sleep(min(exc.retry_after, 2))
+
+    def _work(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            kind, audio, done = job
+            if kind == "partial":
+                self._partial_pending.clear()
+                # A final is already queued behind it and covers the same audio
+                if not self._jobs.empty():
+                    continue
+            try:
+                text = self._run(kind, audio) if audio is not None and len(audio) else ""
+            except QueueFull:
+                if kind == "partial":
+                    continue
+                print("Streaming transcription queue full, segment dropped")
+                text = ""
+            except Exception as exc:
+                print(f"Streaming transcription error: {exc}")
+                text = ""
+            if kind == "partial":
+                if text:
+                    self._on_partial(text)
+            else:
+                self._on_final(text, done)
+
+
+class _Recording:
+    """One socket's current recording, fed in sequence order.
+
+    Flask-SocketIO handles every event in its own thread, so blocks of one
+    recording can arrive out of order, before ``audio_start`` or after
+    ``audio_end``. Blocks wait in ``pending`` until the transcriber exists
+    and every earlier block has been fed; the lock keeps one block at a
+    time inside the transcriber.
+    """
+
+    def __init__(self, recording: int) -> None:
+        self.recording = recording
+        self.transcriber: Optional[StreamingTranscriber] = None
+        self.pending: dict = {}
+        self.next_seq = 0
+        self.blocks: Optional[int] = None  # total sent, known once the client stops
+        self.done = False
+        self.lock = threading.Lock()
+
+    def drain(self) -> None:
+        """Feed every block that is next in line, and finish once all have been fed."""
+        if self.transcriber is None or self.done:
+            return
+        if len(self.pending) > MAX_PENDING_BLOCKS and self.next_seq not in self.pending:
+            # A block has gone missing: skip the gap rather than buffer forever
+            print(f"Live transcription skipped blocks {self.next_seq}-{min(self.pending) - 1}")
+            self.next_seq = min(self.pending)
+        while self.next_seq in self.pending:
+            self.transcriber.feed(self.pending.pop(self.next_seq))
+            self.next_seq += 1
+        if self.blocks is not None and self.next_seq >= self.blocks:
+            self.transcriber.finish()
+            self.transcriber.close()
+            self.pending.clear()
+            self.done = True
+
+
+class StreamSessions:
+    """Live transcribers keyed by Socket.IO session id.
+
+    Clients number their recordings and the blocks within each one
+    (``recording`` and ``seq``); events for an older recording than the
+    socket's current one are dropped, and so are blocks that arrive after
+    their recording was finished. Clients that send neither get blocks fed
+    in arrival order.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[["np.ndarray"], str],
+        emit: Callable[[str, dict, str], None],
+        partials: bool = True,
+    ) -> None:
+        self._transcribe = transcribe
+        self._emit = emit
+        self._partial_interval = settings.stream_partial_interval if partials else 0.0
+        self._streams: dict = {}
+        self._lock = threading.Lock()
+
+    def _recording(self, sid: str, recording: int) -> Optional[_Recording]:
+        """The socket's entry for ``recording``, replacing an older one; None if it is stale."""
+        previous = None
+        with self._lock:
+            current = self._streams.get(sid)
+            if current is not None and current.recording > recording:
+                return None
+            if current is None or current.recording < recording:
+                previous, current = current, _Recording(recording)
+                self._streams[sid] = current
+        if previous is not None:
+            with previous.lock:
+                if previous.transcriber is not None and not previous.done:
+                    previous.transcriber.close()
+                previous.done = True
+        return current
+
+    def start(self, sid: str, sample_rate: int = SAMPLE_RATE, recording: int = 0) -> bool:
+        entry = self._recording(sid, recording)
+        if entry is None:
+            return False
+        with entry.lock:
+            if entry.transcriber is not None:
+                # The same recording number again (clients that do not number them): start over
+                if not entry.done:
+                    entry.transcriber.close()
+                entry.pending.clear()
+                entry.next_seq = 0
+                entry.blocks = None
+                entry.done = False
+            entry.transcriber = StreamingTranscriber(
+                self._transcribe,
+                on_partial=lambda text: self._emit("transcript_partial", {"text": text}, sid),
+                on_final=lambda text, done: self._emit("transcript_final", {"text": text, "done": done}, sid),
+                input_rate=sample_rate,
+                partial_interval=self._partial_interval,
+                end_silence=settings.stream_end_silence,
+                max_segment=settings.stream_max_segment,
+            )
+            entry.drain()
+        return True
+
+    def feed(self, sid: str, pcm, seq: Optional[int] = None, recording: int = 0) -> bool:
+        """Queue a block for the socket's recording; False if it belongs to an older one."""
+        entry = self._recording(sid, recording)
+        if entry is None:
+            return False
+        with entry.lock:
+            if entry.done:
+                return False
+            if seq is None:
+                seq = entry.next_seq + len(entry.pending)
+            if seq >= entry.next_seq:
+                entry.pending[seq] = pcm
+            entry.drain()
+        return True
+
+    def finish(self, sid: str, blocks: Optional[int] = None, recording: int = 0) -> None:
+        """The client stopped after sending ``blocks`` blocks; finalize once they are all in."""
+        entry = self._recording(sid, recording)
+        if entry is None:
+            return
+        with entry.lock:
+            entry.blocks = blocks if blocks is not None else entry.next_seq + len(entry.pending)
+            entry.drain()
+
+    def close(self, sid: str) -> None:
+        with self._lock:
+            entry = self._streams.pop(sid, None)
+        if entry is not None:
+            with entry.lock:
+                if entry.transcriber is not None and not entry.done:
+                    entry.transcriber.close()
+                entry.done = True
+
+
+def wav_bytes(audio: "np.ndarray", sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Encode float32 mono audio as an in-memory 16-bit WAV file."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+def create_stream_sessions(
+    transcribe: Optional[Callable[["np.ndarray"], str]],
+    emit: Callable[[str, dict, str], None],
+    partials: bool = True,
+) -> Optional[StreamSessions]:
+    """Build live transcription sessions, or None when numpy or an STT backend is missing.
+
+    ``partials=False`` transcribes each segment once, when the speaker pauses.
+    """
+    if np is None:
+        print("numpy not available, live transcription disabled")
+        return None
+    if transcribe is None:
+        print("No speech-to-text backend, live transcription disabled")
+        return None
+    return StreamSessions(transcribe, emit, partials)
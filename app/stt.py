@@ -1,29 +1,150 @@
+import io
+import os
+import queue
 import tempfile
+import threading
+import time
 import wave
-from typing import Optional
+from concurrent.futures import Future
+from typing import Callable, Optional
 
 import numpy as np
-import sounddevice as sd
 
 from .config import settings
+from .models import get_whisper_model
+from .resample import resample
+from .streaming import FRAME_MS, FrameClassifier, RingBuffer
+
+
+class BatchTranscriber:
+    """Coalesces concurrent short clips into one batched Whisper call.
+
+    The first clip to arrive opens a window of ``window_ms``; clips that
+    arrive before it closes (up to ``max_batch``) are padded to Whisper's
+    30 s input, encoded together and decoded in a single beam search, and
+    each caller gets its own transcript back. If the batched call fails,
+    every clip in the batch goes through ``fallback`` instead.
+    """
+
+    max_samples = 30 * 16000  # one encoder window
+
+    def __init__(self, model, window_ms: float, max_batch: int, fallback: Callable[[np.ndarray], str]) -> None:
+        self._model = model
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._fallback = fallback
+        self._tokenizer = None
+        self._suppress_tokens = [-1]
+        self._queue: queue.Queue = queue.Queue()
+        self.batches = 0
+        self.clips = 0
+        thread = threading.Thread(target=self._loop, name="stt-batcher", daemon=True)
+        thread.start()
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        """Queue a clip of at most ``max_samples`` and block until its batch is decoded."""
+        future: Future = Future()
+        self._queue.put((audio, future))
+        return future.result()
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run(batch)
+
+    def _run(self, batch: list) -> None:
+        try:
+            texts = self._decode([audio for audio, _future in batch])
+        except Exception as exc:
+            print(f"Batched transcription failed ({exc}), transcribing clips one by one")
+            texts = None
+        self.batches += 1
+        self.clips += len(batch)
+        for i, (audio, future) in enumerate(batch):
+            if texts is not None:
+                future.set_result(texts[i])
+                continue
+            try:
+                future.set_result(self._fallback(audio))
+            except Exception as exc:
+                future.set_exception(exc)
+
+    def _ensure_tokenizer(self) -> None:
+        if self._tokenizer is not None:
+            return
+        from faster_whisper.tokenizer import Tokenizer  # type: ignore
+        from faster_whisper.transcribe import get_suppressed_tokens  # type: ignore
+
+        model = self._model
+        self._tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language="en")
+        self._suppress_tokens = get_suppressed_tokens(self._tokenizer, [-1])
+
+    def _decode(self, clips: list) -> list:
+        from faster_whisper.audio import pad_or_trim  # type: ignore
+
+        self._ensure_tokenizer()
+        model = self._model
+        frames = model.feature_extractor.nb_max_frames
+        features = np.stack([pad_or_trim(model.feature_extractor(clip), frames) for clip in clips])
+        prompt = model.get_prompt(self._tokenizer, [], without_timestamps=True)
+        results = model.model.generate(
+            model.encode(features),
+            [list(prompt) for _ in clips],
+            beam_size=5,
+            max_length=model.max_length,
+            suppress_blank=True,
+            suppress_tokens=self._suppress_tokens,
+            return_no_speech_prob=True,
+        )
+        texts = []
+        for result in results:
+            # Same silence cut-off faster-whisper applies per segment
+            if result.no_speech_prob > 0.6:
+                texts.append("")
+            else:
+                texts.append(self._tokenizer.decode(result.sequences_ids[0]).strip())
+        return texts
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "clips": self.clips,
+            "avg_batch": self.clips / self.batches if self.batches else 0.0,
+        }
 
 
 class STT:
+    _init_lock = threading.Lock()
+
     def __init__(self) -> None:
         self._model = None
+        self._batcher: Optional[BatchTranscriber] = None
         self.sample_rate = 16000
-        self.chunk_duration = 0.1  # 100ms chunks for VAD
 
     def _ensure_model(self) -> None:
-        if self._model is None:
-            try:
-                from faster_whisper import WhisperModel  # type: ignore
-            except Exception as exc:  # pragma: no cover
-                raise RuntimeError(
-                    "faster-whisper is not installed. Install requirements or use --text mode."
-                ) from exc
-            # Default to int8 for CPU speed; users can tweak later
-            self._model = WhisperModel(settings.whisper_model, compute_type="int8")
+        if self._model is not None:
+            return
+        with self._init_lock:
+            if self._model is not None:
+                return
+            # Shared across STT instances; loaded once per process
+            model = get_whisper_model()
+            if settings.stt_batch_window_ms > 0:
+                self._batcher = BatchTranscriber(
+                    model, settings.stt_batch_window_ms, settings.stt_batch_size, self._transcribe_single
+                )
+            self._model = model
 
     def _save_audio_to_file(self, audio_data: np.ndarray) -> str:
         """Save audio data to a temporary WAV file."""
@@ -44,32 +165,81 @@ class STT:
         text_parts = [seg.text for seg in segments]
         return " ".join(text_parts).strip()
 
+    def transcribe_array(self, audio: np.ndarray) -> str:
+        """Transcribe mono float32 audio at ``self.sample_rate`` without touching disk.
+
+        With batching enabled, clips up to 30 s share a batched model call
+        with other concurrent requests; longer clips are transcribed alone.
+        """
+        self._ensure_model()
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        if self._batcher is not None and len(audio) <= self._batcher.max_samples:
+            return self._batcher.transcribe(audio)
+        return self._transcribe_single(audio)
+
+    def batch_stats(self) -> Optional[dict]:
+        return self._batcher.stats() if self._batcher is not None else None
+
+    def _transcribe_single(self, audio: np.ndarray) -> str:
+        assert self._model is not None
+        segments, _info = self._model.transcribe(audio)
+        text_parts = [seg.text for seg in segments]
+        return " ".join(text_parts).strip()
+
     def transcribe_buffer(self, audio: np.ndarray, sample_rate: int) -> str:
         """Transcribe audio buffer directly."""
         self._ensure_model()
         assert self._model is not None
         
-        # Resample if needed
+        # Resample if needed (anti-aliased polyphase filter, float32 throughout)
         if sample_rate != self.sample_rate:
-            # Simple resampling - in production you'd use librosa or scipy
-            ratio = self.sample_rate / sample_rate
-            new_length = int(len(audio) * ratio)
-            audio = np.interp(np.linspace(0, len(audio), new_length), 
-                            np.arange(len(audio)), audio)
+            audio = resample(audio, sample_rate, self.sample_rate)
+        
+        try:
+            return self.transcribe_array(audio)
+        except Exception as exc:
+            print(f"In-memory transcription failed ({exc}), retrying via temp file")
         
-        # Save to temp file and transcribe
+        # Fallback: save to temp file and transcribe
         temp_file = self._save_audio_to_file(audio)
         try:
             return self.transcribe_file(temp_file)
         finally:
-            import os
             try:
                 os.unlink(temp_file)
             except OSError:
                 pass
 
+    def transcribe_bytes(self, data: bytes, suffix: str = ".webm") -> str:
+        """Transcribe an encoded upload (webm, wav, mp3, ...) held in memory.
+
+        The bytes are decoded straight into a float32 array; only if that
+        fails are they written to a temp file with ``suffix`` for the model
+        to read back.
+        """
+        self._ensure_model()
+        try:
+            from faster_whisper import decode_audio  # type: ignore
+
+            audio = decode_audio(io.BytesIO(data), sampling_rate=self.sample_rate)
+            return self.transcribe_array(audio)
+        except Exception as exc:
+            print(f"In-memory decode failed ({exc}), retrying via temp file")
+        
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp_file:
+            tmp_file.write(data)
+        try:
+            return self.transcribe_file(tmp_file.name)
+        finally:
+            try:
+                os.unlink(tmp_file.name)
+            except OSError:
+                pass
+
     def record_audio(self, duration: float = 5.0) -> np.ndarray:
         """Record audio for specified duration."""
+        import sounddevice as sd
+
         print(f"Recording for {duration} seconds...")
         audio = sd.rec(int(duration * self.sample_rate), 
                       samplerate=self.sample_rate, 
@@ -79,57 +249,47 @@ class STT:
         return audio.flatten()
 
     def record_with_vad(self, max_duration: float = 10.0, silence_threshold: float = 0.01) -> np.ndarray:
-        """Record audio with Voice Activity Detection."""
+        """Record audio with Voice Activity Detection.
+
+        The audio callback writes each 30 ms frame into a preallocated ring
+        buffer and classifies it (webrtcvad, or RMS against
+        ``silence_threshold`` without it). Two seconds of silence after
+        speech, or ``max_duration``, sets an event that ends the recording.
+        """
+        import sounddevice as sd
+
         if not settings.use_vad:
             return self.record_audio(max_duration)
         
-        try:
-            import webrtcvad
-            vad = webrtcvad.Vad(2)  # Aggressiveness level 0-3
-        except ImportError:
-            print("webrtcvad not available, falling back to timed recording")
-            return self.record_audio(max_duration)
+        frame_len = self.sample_rate * FRAME_MS // 1000
+        classifier = FrameClassifier(self.sample_rate, aggressiveness=2, energy_threshold=silence_threshold)
+        buffer = RingBuffer(int(max_duration * self.sample_rate))
+        max_silence_frames = int(2000 / FRAME_MS)  # 2 seconds of silence
+        state = {"speech": False, "silence": 0}
+        finished = threading.Event()
         
-        print("Recording with VAD (speak now, silence to stop)...")
-        chunk_size = int(self.sample_rate * self.chunk_duration)
-        audio_chunks = []
-        silence_count = 0
-        max_silence_chunks = int(2.0 / self.chunk_duration)  # 2 seconds of silence
-        
-        def audio_callback(indata, frames, time, status):
+        def audio_callback(indata, frames, time_info, status):
             if status:
                 print(f"Audio callback status: {status}")
-            audio_chunks.append(indata.copy())
+            if finished.is_set():
+                return
+            frame = indata[:, 0]
+            buffer.write(frame)
+            if classifier.is_speech(frame):
+                state["speech"] = True
+                state["silence"] = 0
+            elif state["speech"]:
+                state["silence"] += 1
+            if state["silence"] >= max_silence_frames or len(buffer) >= buffer.capacity:
+                finished.set()
         
+        print("Recording with VAD (speak now, silence to stop)...")
         with sd.InputStream(samplerate=self.sample_rate, 
                           channels=1, 
                           dtype=np.float32,
-                          blocksize=chunk_size,
+                          blocksize=frame_len,
                           callback=audio_callback):
-            for _ in range(int(max_duration / self.chunk_duration)):
-                sd.sleep(int(self.chunk_duration * 1000))
-                
-                if len(audio_chunks) > 0:
-                    # Convert to int16 for VAD
-                    chunk = audio_chunks[-1].flatten()
-                    chunk_int16 = (chunk * 32767).astype(np.int16)
-                    
-                    # Check for voice activity
-                    try:
-                        is_speech = vad.is_speech(chunk_int16.tobytes(), self.sample_rate)
-                        if is_speech:
-                            silence_count = 0
-                        else:
-                            silence_count += 1
-                            
-                        if silence_count >= max_silence_chunks:
-                            print("Silence detected, stopping recording...")
-                            break
-                    except Exception:
-                        # VAD failed, continue recording
-                        pass
+            if finished.wait(max_duration) and state["silence"] >= max_silence_frames:
+                print("Silence detected, stopping recording...")
         
-        if audio_chunks:
-            return np.concatenate(audio_chunks).flatten()
-        else:
-            return np.array([], dtype=np.float32)
+        return buffer.read()
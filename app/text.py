@@ -0,0 +1,68 @@
+"""Sentence splitting for speaking replies while they are still being generated."""
+
+import re
+from typing import List, Optional
+
+
+# Words that end in a full stop without ending the sentence
+ABBREVIATIONS = frozenset(
+    "mr mrs ms dr prof sr jr st vs etc approx inc ltd co dept fig no e.g i.e".split()
+)
+
+# Sentence-final punctuation (plus closing quotes/brackets) followed by
+# whitespace, or a line break on its own
+_BOUNDARY = re.compile(r"[.!?…]+[\"')\]”’]*(?=\s)|\n")
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    """True if the full stop ending at ``end`` belongs to an abbreviation or initial."""
+    if text[end - 1] != ".":
+        return False
+    words = text[:end - 1].split()
+    if not words:
+        return False
+    word = words[-1].lower().lstrip("(\"'")
+    return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+class SentenceChunker:
+    """Turns a stream of text fragments (e.g. LLM tokens) into whole sentences.
+
+    A sentence is emitted as soon as its closing punctuation is followed by
+    whitespace, so it can be spoken while the rest of the reply is still
+    being generated.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+
+    def feed(self, fragment: str) -> List[str]:
+        """Add ``fragment`` and return any sentences it completed."""
+        self._buffer += fragment
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            end = match.end()
+            if _is_abbreviation(self._buffer, end):
+                continue
+            sentence = self._buffer[start:end].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = end
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream has ended."""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+
+def split_sentences(text: str) -> List[str]:
+    chunker = SentenceChunker()
+    sentences = chunker.feed(text)
+    rest = chunker.flush()
+    if rest:
+        sentences.append(rest)
+    return sentences
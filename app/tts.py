@@ -1,86 +1,58 @@
-import asyncio
-import os
-import subprocess
-import tempfile
+import io
+import queue
 import threading
 import time
-from typing import Optional
+from concurrent.futures import CancelledError, Future
+from typing import AsyncIterator, Iterator, Optional
 
-from .config import settings
+from .aio import iterate_async
+from .cancel import CancelToken, cancelled
+from .text import split_sentences
+from .tts_backends import Clip, create_backend_registry
+
+
+# Male British voice that sounds like Jarvis - good quality and speed
+EDGE_VOICE = "en-GB-RyanNeural"
+EDGE_RATE = "+0%"
+
+
+async def stream_speech(text: str, voice: str = EDGE_VOICE, rate: str = EDGE_RATE) -> AsyncIterator[bytes]:
+    """Yield MP3 chunks from edge-tts as they are synthesized."""
+    import edge_tts
+
+    communicate = edge_tts.Communicate(text, voice, rate=rate)
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
+
+
+async def synthesize_speech(text: str, voice: str = EDGE_VOICE, rate: str = EDGE_RATE) -> bytes:
+    """Synthesize ``text`` with edge-tts and return the MP3 bytes."""
+    return b"".join([chunk async for chunk in stream_speech(text, voice, rate)])
+
+
+def iter_speech(
+    text: str, voice: str = EDGE_VOICE, rate: str = EDGE_RATE, cancel: Optional[CancelToken] = None
+) -> Iterator[bytes]:
+    """Synchronous view of ``stream_speech`` for WSGI streaming responses; ``cancel`` ends it."""
+    return iterate_async(stream_speech(text, voice, rate), cancel=cancel)
 
 
 class TTS:
     def __init__(self) -> None:
-        self._festival_available = None
-        self._edge_tts_available = None
-        self._pyttsx3_engine = None
-        self._lock = threading.Lock()
-        # Use a male British voice that sounds more like Jarvis
-        self._edge_voice = "en-GB-RyanNeural"  # Male British voice - good quality and speed
-
-    def _check_festival(self) -> bool:
-        if self._festival_available is None:
-            try:
-                # Check if festival is available
-                result = subprocess.run(['which', 'festival'], capture_output=True, text=True)
-                self._festival_available = result.returncode == 0
-            except Exception:
-                self._festival_available = False
-        return self._festival_available
-
-    def _check_edge_tts(self) -> bool:
-        if self._edge_tts_available is None:
-            try:
-                import edge_tts
-                import pygame
-                pygame.mixer.init()
-                self._edge_tts_available = True
-            except Exception:
-                self._edge_tts_available = False
-        return self._edge_tts_available
+        self._backends = create_backend_registry(EDGE_VOICE)
+        self._player = None
+        self._lock = threading.RLock()  # say() holds it across play() calls
 
-    def _get_pyttsx3_engine(self) -> Optional[object]:
-        if self._pyttsx3_engine is None:
-            try:
-                import pyttsx3  # type: ignore
-                engine = pyttsx3.init()
-                
-                # Try to find a male voice
-                voices = engine.getProperty('voices')
-                if voices:
-                    # Look for male voices first - prioritize British Received Pronunciation
-                    male_voice = None
-                    for voice in voices:
-                        if 'received pronunciation' in voice.name.lower():
-                            male_voice = voice
-                            break
-                    
-                    # If no RP voice, try other British male voices
-                    if not male_voice:
-                        for voice in voices:
-                            if any(indicator in voice.name.lower() for indicator in ['great britain', 'en-gb', 'lancaster', 'west midlands']):
-                                male_voice = voice
-                                break
-                    
-                    # If still no male voice found, try other indicators
-                    if not male_voice:
-                        for voice in voices:
-                            if any(indicator in voice.name.lower() for indicator in ['david', 'alex', 'daniel', 'male', 'man']):
-                                male_voice = voice
-                                break
-                    
-                    if male_voice:
-                        engine.setProperty('voice', male_voice.id)
-                
-                # Jarvis-like settings: slower, more deliberate, deeper male voice
-                engine.setProperty("rate", 140)  # Slower, more deliberate
-                engine.setProperty("volume", 0.95)  # Good volume
-                engine.setProperty("pitch", 0.5)  # Much lower pitch for deep male voice
-                
-                self._pyttsx3_engine = engine
-            except Exception:
-                self._pyttsx3_engine = False  # Mark as failed to avoid retrying
-        return self._pyttsx3_engine if self._pyttsx3_engine is not False else None
+    def probe_backends(self, wait: bool = True) -> None:
+        """Probe every speech backend now instead of on the first reply."""
+        if wait:
+            self._backends.probe()
+        else:
+            self._backends.probe_in_background()
+
+    def backend_status(self) -> list:
+        return self._backends.status()
 
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text to sound more like Jarvis."""
@@ -98,89 +70,178 @@ class TTS:
             
         return text
 
-    def say(self, text: str) -> None:
+    def say(self, text: str, cancel: Optional[CancelToken] = None) -> None:
+        """Speak ``text``; cancelling ``cancel`` stops synthesis and playback at once."""
         if not text:
             return
         
-        # Preprocess text for Jarvis-like delivery
-        processed_text = self._preprocess_text(text)
-        
         with self._lock:
-            # Add a minimal delay before speaking (Jarvis thinking)
-            time.sleep(0.1)
-            
-            # Try Edge TTS first (fastest and good quality)
-            if self._check_edge_tts():
-                self._say_with_edge_tts(processed_text)
-            elif self._check_festival():
-                self._say_with_festival(processed_text)
+            if cancelled(cancel):
+                return
+
+            # Render and play one sentence at a time when a backend can produce audio
+            if self._backends.ranked(renders=True):
+                self._say_incremental(split_sentences(text), cancel)
             else:
-                # Fallback to pyttsx3
-                engine = self._get_pyttsx3_engine()
-                if engine is not None:
-                    try:
-                        engine.say(processed_text)
-                        engine.runAndWait()
-                    except Exception:
-                        # Ignore cleanup errors
-                        pass
-
-    def _say_with_edge_tts(self, text: str) -> None:
-        """Use Microsoft Edge TTS for much better voice quality."""
-        try:
-            import edge_tts
-            import pygame
-            
-            # Create temporary file for audio
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp_file:
-                # Run the async function in a new event loop
-                asyncio.run(self._generate_speech(text, tmp_file.name))
-                
-                # Play the audio
-                pygame.mixer.music.load(tmp_file.name)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to finish
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-                
-                # Clean up
-                os.unlink(tmp_file.name)
-                
-        except Exception as e:
-            print(f"Edge TTS failed: {e}, falling back to pyttsx3")
-            # Fallback to pyttsx3
-            engine = self._get_pyttsx3_engine()
-            if engine is not None:
+                self.speak(self._preprocess_text(text), cancel)
+
+    def _say_incremental(self, sentences: list, cancel: Optional[CancelToken] = None) -> None:
+        """Render sentence N+1 while sentence N plays, so speech starts after the first sentence."""
+        clips: queue.Queue = queue.Queue(maxsize=1)
+        stopped = threading.Event()
+
+        def hand_over(item) -> bool:
+            # Never block for good: the consumer stops taking clips once it is done
+            while not stopped.is_set():
                 try:
-                    engine.say(text)
-                    engine.runAndWait()
-                except Exception:
+                    clips.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
                     pass
+            return False
+
+        def render_all():
+            try:
+                for index, sentence in enumerate(sentences):
+                    if stopped.is_set() or cancelled(cancel):
+                        break
+                    # Jarvis-style phrasing only applies to the opening sentence
+                    if not hand_over((sentence, self.render(sentence, preprocess=index == 0, cancel=cancel))):
+                        break
+            except Exception as e:
+                print(f"Sentence rendering failed: {e}")
+            finally:
+                # Always end the consumer's loop, which waits on clips.get() holding self._lock
+                hand_over(None)
 
-    def _say_with_festival(self, text: str) -> None:
-        """Use Festival TTS for better voice quality with optimizations."""
+        threading.Thread(target=render_all, name="tts-render", daemon=True).start()
+        playing = None
         try:
-            # Use festival with optimized settings for faster response
-            # Use a more direct approach with less overhead
-            cmd = ['festival', '--tts']
-            process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            process.stdin.write(text.encode())
-            process.stdin.close()
-            
-            # Don't wait for completion - let it run in background for better responsiveness
-            # The audio will play while we continue
-            process.wait()
-            
-        except Exception as e:
-            print(f"Festival failed: {e}, falling back to Edge TTS")
-            # Fallback to Edge TTS
-            self._say_with_edge_tts(text)
-
-    async def _generate_speech(self, text: str, output_file: str) -> None:
-        """Generate speech using edge-tts."""
-        import edge_tts
-        
-        # Use a male British voice with Jarvis-like characteristics
-        communicate = edge_tts.Communicate(text, self._edge_voice)
-        await communicate.save(output_file)
+            while True:
+                item = clips.get()
+                if item is None or cancelled(cancel):
+                    break
+                sentence, clip = item
+                queued = None
+                if clip is not None:
+                    try:
+                        queued = self.queue_audio(clip.data, cancel, clip.format)
+                    except Exception as e:
+                        print(f"Stream playback failed: {e}, falling back")
+                # The next clip is queued before the current one ends, so they play back to back
+                self.wait_played(playing)
+                playing = queued
+                if queued is not None:
+                    continue
+                try:
+                    if clip is not None:
+                        self._play_with_pygame(clip.data, cancel, clip.format)
+                    else:
+                        self.speak(sentence, cancel)
+                except Exception as e:
+                    print(f"TTS playback failed: {e}, falling back")
+                    self.speak(sentence, cancel)
+            self.wait_played(playing)
+        finally:
+            # Lets the render thread give up on a clip it is waiting to hand over
+            stopped.set()
+
+    def speak(self, text: str, cancel: Optional[CancelToken] = None) -> None:
+        """Speak through a backend that talks directly, for text no backend could render."""
+        for backend in self._backends.ranked(renders=False):
+            if cancelled(cancel):
+                return
+            try:
+                backend.speak(text, cancel)
+                self._backends.succeeded(backend)
+                return
+            except Exception as e:
+                self._backends.failed(backend, e)
+
+    def render(self, text: str, preprocess: bool = True, cancel: Optional[CancelToken] = None) -> Optional[Clip]:
+        """Synthesize ``text`` on the fastest healthy backend without playing it.
+
+        Returns None when no backend could render it or it was cancelled;
+        callers then fall back to :meth:`speak`.
+        """
+        if not text or cancelled(cancel):
+            return None
+        if preprocess:
+            text = self._preprocess_text(text)
+        for backend in self._backends.ranked(renders=True):
+            start = time.perf_counter()
+            try:
+                clip = backend.synthesize(text, cancel=cancel)
+            except Exception as e:
+                if cancelled(cancel):
+                    return None
+                self._backends.failed(backend, e)
+                continue
+            self._backends.succeeded(backend, time.perf_counter() - start)
+            return clip
+        return None
+
+    def _get_player(self):
+        if self._player is None:
+            try:
+                from .playback import get_playback_engine
+                self._player = get_playback_engine() or False
+            except ImportError:
+                self._player = False
+        return self._player if self._player is not False else None
+
+    def queue_audio(self, data: bytes, cancel: Optional[CancelToken] = None, format: str = "mp3") -> Optional[Future]:
+        """Queue MP3 (or WAV) bytes on the playback engine without waiting for them to play.
+
+        Returns a future that resolves once the clip has played (or is
+        cancelled along with ``cancel``), or None when the engine is
+        unavailable and :meth:`play` has to go through pygame.
+        """
+        engine = self._get_player()
+        if engine is None:
+            return None
+        if cancelled(cancel):
+            future: Future = Future()
+            future.cancel()
+            return future
+        future = engine.play_file(data, format)
+        if cancel is not None:
+            release = cancel.on_cancel(future.cancel)
+            future.add_done_callback(lambda _: release())
+        return future
+
+    @staticmethod
+    def wait_played(future: Optional[Future]) -> None:
+        """Block until a clip from :meth:`queue_audio` has finished or been cancelled."""
+        if future is None:
+            return
+        try:
+            future.result()
+        except CancelledError:
+            pass
+
+    def play(self, data: bytes, cancel: Optional[CancelToken] = None, format: str = "mp3") -> None:
+        """Play audio bytes from :meth:`render`, blocking until playback ends or is cancelled."""
+        future = self.queue_audio(data, cancel, format)
+        if future is not None:
+            self.wait_played(future)
+        else:
+            self._play_with_pygame(data, cancel, format)
+
+    def _play_with_pygame(self, data: bytes, cancel: Optional[CancelToken] = None, format: str = "mp3") -> None:
+        import pygame
+
+        with self._lock:
+            if cancelled(cancel):
+                return
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.music.load(io.BytesIO(data), format)
+            pygame.mixer.music.play()
+            release = cancel.on_cancel(pygame.mixer.music.stop) if cancel is not None else None
+            try:
+                while pygame.mixer.music.get_busy():
+                    time.sleep(0.05)
+            finally:
+                if release is not None:
+                    release()
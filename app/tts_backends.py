@@ -0,0 +1,314 @@
+"""Speech backends ranked by measured latency, with per-backend circuit breakers.
+
+At start-up every configured backend is probed in parallel by synthesizing
+a short phrase, and the registry orders them by how long that took (kept
+up to date with a moving average of real syntheses). A backend that fails
+is skipped for ``cooldown`` seconds before it is tried again, so a
+degraded backend costs one failure per cooldown instead of adding its
+timeout to every reply.
+
+Rendering backends (edge-tts, Festival) return audio that the caller
+plays itself; pyttsx3 can only speak directly, so it is ranked after them.
+"""
+
+import io
+import subprocess
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, NamedTuple, Optional
+
+from .aio import run_async
+from .cancel import CancelToken
+from .config import settings
+
+
+PROBE_TEXT = "Ready."
+
+
+class Clip(NamedTuple):
+    data: bytes
+    format: str  # container understood by the playback engine and pygame
+
+
+class CircuitBreaker:
+    """Closed until a failure, then open for ``cooldown`` seconds, then half-open until the next result."""
+
+    def __init__(self, cooldown: float = 30.0) -> None:
+        self.cooldown = cooldown
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def record_success(self) -> None:
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._opened_at = time.monotonic()
+
+
+class SpeechBackend:
+    name = ""
+    renders = True  # False for backends that can only speak out loud
+
+    def __init__(self, cooldown: float = 30.0) -> None:
+        self.breaker = CircuitBreaker(cooldown)
+        self.latency: Optional[float] = None  # seconds, moving average
+        self.ready = False  # set once a probe has succeeded
+
+    def probe(self, timeout: float) -> Optional[float]:
+        """Raise if the backend cannot be used; return its synthesis time in seconds."""
+        start = time.perf_counter()
+        self.synthesize(PROBE_TEXT, timeout=timeout)
+        return time.perf_counter() - start
+
+    def synthesize(self, text: str, cancel: Optional[CancelToken] = None, timeout: Optional[float] = None) -> Clip:
+        """Render ``text`` to a clip; only called on backends with ``renders`` set."""
+        raise RuntimeError(f"TTS backend {self.name} cannot render audio")
+
+    def speak(self, text: str, cancel: Optional[CancelToken] = None) -> None:
+        """Say ``text`` out loud; only called on backends without ``renders``."""
+        raise RuntimeError(f"TTS backend {self.name} can only render audio")
+
+    def close(self) -> None:
+        pass
+
+
+class EdgeBackend(SpeechBackend):
+    name = "edge"
+
+    def __init__(self, voice: str, cooldown: float = 30.0) -> None:
+        super().__init__(cooldown)
+        self.voice = voice
+
+    def synthesize(self, text: str, cancel: Optional[CancelToken] = None, timeout: Optional[float] = None) -> Clip:
+        from .tts import synthesize_speech
+
+        data = run_async(synthesize_speech(text, self.voice), timeout=timeout, cancel=cancel)
+        if not data:
+            raise RuntimeError("edge-tts returned no audio")
+        return Clip(data, "mp3")
+
+
+class FestivalBackend(SpeechBackend):
+    name = "festival"
+
+    def __init__(self, port: int, cooldown: float = 30.0) -> None:
+        super().__init__(cooldown)
+        self._server = None
+        self._port = port
+
+    def probe(self, timeout: float) -> Optional[float]:
+        if self._server is None:
+            if subprocess.run(["which", "festival"], capture_output=True).returncode != 0:
+                raise RuntimeError("festival is not installed")
+            from .festival import FestivalServer
+
+            self._server = FestivalServer(port=self._port, start_timeout=timeout)
+        # The ping starts (or restarts) the server; time a synthesis for the ranking
+        if not self._server.healthy():
+            raise RuntimeError("festival server is not responding")
+        return super().probe(timeout)
+
+    def synthesize(self, text: str, cancel: Optional[CancelToken] = None, timeout: Optional[float] = None) -> Clip:
+        if self._server is None:
+            raise RuntimeError("festival has not been probed")
+        waves = self._server.synthesize(text)
+        if not waves:
+            raise RuntimeError("festival returned no audio")
+        return Clip(_join_wavs(waves), "wav")
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+
+def _join_wavs(waves: List[bytes]) -> bytes:
+    """Concatenate Festival's per-utterance WAV files into one."""
+    if len(waves) == 1:
+        return waves[0]
+    out = io.BytesIO()
+    with wave.open(out, "wb") as writer:
+        for index, data in enumerate(waves):
+            with wave.open(io.BytesIO(data), "rb") as reader:
+                if index == 0:
+                    writer.setparams(reader.getparams())
+                writer.writeframes(reader.readframes(reader.getnframes()))
+    return out.getvalue()
+
+
+class Pyttsx3Backend(SpeechBackend):
+    name = "pyttsx3"
+    renders = False
+
+    def __init__(self, cooldown: float = 30.0) -> None:
+        super().__init__(cooldown)
+        self._engine = None
+
+    def probe(self, timeout: float) -> Optional[float]:
+        import pyttsx3  # type: ignore
+
+        engine = pyttsx3.init()
+
+        # Try to find a male voice
+        voices = engine.getProperty('voices')
+        if voices:
+            # Look for male voices first - prioritize British Received Pronunciation
+            male_voice = None
+            for voice in voices:
+                if 'received pronunciation' in voice.name.lower():
+                    male_voice = voice
+                    break
+
+            # If no RP voice, try other British male voices
+            if not male_voice:
+                for voice in voices:
+                    if any(indicator in voice.name.lower() for indicator in ['great britain', 'en-gb', 'lancaster', 'west midlands']):
+                        male_voice = voice
+                        break
+
+            # If still no male voice found, try other indicators
+            if not male_voice:
+                for voice in voices:
+                    if any(indicator in voice.name.lower() for indicator in ['david', 'alex', 'daniel', 'male', 'man']):
+                        male_voice = voice
+                        break
+
+            if male_voice:
+                engine.setProperty('voice', male_voice.id)
+
+        # Jarvis-like settings: slower, more deliberate, deeper male voice
+        engine.setProperty("rate", 140)  # Slower, more deliberate
+        engine.setProperty("volume", 0.95)  # Good volume
+        engine.setProperty("pitch", 0.5)  # Much lower pitch for deep male voice
+
+        self._engine = engine
+        return None
+
+    def speak(self, text: str, cancel: Optional[CancelToken] = None) -> None:
+        if self._engine is None:
+            raise RuntimeError("pyttsx3 has not been probed")
+        release = cancel.on_cancel(self._engine.stop) if cancel is not None else None
+        try:
+            self._engine.say(text)
+            self._engine.runAndWait()
+        finally:
+            if release is not None:
+                release()
+
+
+class BackendRegistry:
+    def __init__(self, backends: List[SpeechBackend], probe_timeout: float = 5.0) -> None:
+        self.backends = backends
+        self.probe_timeout = probe_timeout
+        self._probed = threading.Event()
+        self._lock = threading.Lock()
+        self._probing = False
+
+    def _probe_one(self, backend: SpeechBackend) -> None:
+        try:
+            backend.latency = backend.probe(self.probe_timeout)
+        except Exception as e:
+            backend.breaker.record_failure()
+            print(f"TTS backend {backend.name} unavailable: {e}")
+            return
+        backend.ready = True
+        backend.breaker.record_success()
+
+    def probe(self) -> None:
+        """Probe every backend in parallel, waiting at most ``probe_timeout``.
+
+        A backend whose probe is still running afterwards joins the ranking
+        when it finishes.
+        """
+        with self._lock:
+            first, self._probing = not self._probing, True
+        if not first:
+            self._probed.wait()
+            return
+        pool = ThreadPoolExecutor(max_workers=max(1, len(self.backends)), thread_name_prefix="tts-probe")
+        futures = [pool.submit(self._probe_one, backend) for backend in self.backends]
+        wait(futures, timeout=self.probe_timeout)
+        pool.shutdown(wait=False)
+        ranked = ", ".join(
+            f"{b.name} ({b.latency * 1000:.0f} ms)" if b.latency is not None else b.name
+            for b in self._rank(None)
+        )
+        print(f"TTS backends: {ranked or 'none available'}")
+        self._probed.set()
+
+    def probe_in_background(self) -> None:
+        threading.Thread(target=self.probe, name="tts-probe", daemon=True).start()
+
+    def _rank(self, renders: Optional[bool]) -> List[SpeechBackend]:
+        candidates = []
+        for backend in self.backends:
+            if renders is not None and backend.renders != renders:
+                continue
+            state = backend.breaker.state
+            if not backend.ready:
+                if state == "half-open":
+                    # Unavailable at start-up: probe again in the background once per cooldown
+                    backend.breaker.record_failure()
+                    threading.Thread(target=self._probe_one, args=(backend,), name="tts-probe", daemon=True).start()
+                continue
+            if state != "open":
+                candidates.append(backend)
+        return sorted(candidates, key=lambda b: (not b.renders, b.latency if b.latency is not None else float("inf")))
+
+    def ranked(self, renders: Optional[bool] = None) -> List[SpeechBackend]:
+        """Usable backends, fastest renderer first, probing on first use."""
+        if not self._probed.is_set():
+            self.probe()
+        with self._lock:
+            return self._rank(renders)
+
+    def succeeded(self, backend: SpeechBackend, seconds: Optional[float] = None) -> None:
+        backend.breaker.record_success()
+        if seconds is not None:
+            backend.latency = seconds if backend.latency is None else 0.8 * backend.latency + 0.2 * seconds
+
+    def failed(self, backend: SpeechBackend, error: Exception) -> None:
+        backend.breaker.record_failure()
+        print(f"TTS backend {backend.name} failed ({error}), cooling down for {backend.breaker.cooldown:g}s")
+
+    def status(self) -> List[dict]:
+        return [
+            {
+                "name": b.name,
+                "state": b.breaker.state if b.ready else "unavailable",
+                "latency_ms": round(b.latency * 1000, 1) if b.latency is not None else None,
+            }
+            for b in self.backends
+        ]
+
+    def close(self) -> None:
+        for backend in self.backends:
+            backend.close()
+
+
+def create_backend_registry(voice: str) -> BackendRegistry:
+    """Build the backends named in ``settings.tts_backends``."""
+    cooldown = settings.tts_breaker_cooldown
+    factories = {
+        "edge": lambda: EdgeBackend(voice, cooldown),
+        "festival": lambda: FestivalBackend(settings.festival_port, cooldown),
+        "pyttsx3": lambda: Pyttsx3Backend(cooldown),
+    }
+    backends = []
+    for name in settings.tts_backends.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in factories:
+            print(f"Unknown TTS backend {name!r}, ignoring")
+            continue
+        backends.append(factories[name]())
+    return BackendRegistry(backends, probe_timeout=settings.tts_probe_timeout)
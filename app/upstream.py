@@ -0,0 +1,137 @@
+"""Shared HTTP clients for upstream LLM/STT services.
+
+Every call to Ollama, OpenAI or Hugging Face goes through one pooled
+client so connections (and their TLS sessions) are reused across requests
+instead of being re-established per call. Chat completions use an
+``httpx.AsyncClient`` on the :mod:`app.aio` loop, where hundreds of
+in-flight replies cost a coroutine each rather than a blocked thread;
+uploads and other one-shot calls use a ``requests.Session``.
+"""
+
+import asyncio
+import socket
+import threading
+from typing import Optional
+
+import requests
+
+try:
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+from .config import settings
+
+
+# Transient upstream failures worth retrying; anything else is returned as-is
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class StreamInterrupted(RuntimeError):
+    """A streamed reply broke off after part of it was delivered."""
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client = None
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive on pooled sockets."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session() -> requests.Session:
+    retry = Retry(
+        total=settings.upstream_retries,
+        connect=settings.upstream_retries,
+        read=0,  # never replay a request the upstream may already be generating for
+        status=settings.upstream_retries,
+        backoff_factor=settings.upstream_backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _KeepAliveAdapter(
+        pool_connections=settings.upstream_pool_hosts,
+        pool_maxsize=settings.upstream_pool_size,
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide upstream session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def default_timeout() -> tuple:
+    return (settings.upstream_connect_timeout, settings.upstream_read_timeout)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared session with the configured connect/read timeouts."""
+    kwargs.setdefault("timeout", default_timeout())
+    return get_session().post(url, **kwargs)
+
+
+def get_async_client() -> "httpx.AsyncClient":
+    """Return the process-wide async client; only use it on the :mod:`app.aio` loop."""
+    global _async_client
+    if httpx is None:
+        raise RuntimeError("httpx is not installed; async upstream calls are unavailable")
+    if _async_client is None:
+        with _session_lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=settings.upstream_async_connections,
+                        max_keepalive_connections=settings.upstream_pool_hosts * settings.upstream_pool_size,
+                    ),
+                    timeout=httpx.Timeout(
+                        settings.upstream_read_timeout,
+                        connect=settings.upstream_connect_timeout,
+                    ),
+                    transport=httpx.AsyncHTTPTransport(retries=settings.upstream_retries),
+                )
+    return _async_client
+
+
+def _retry_delay(resp: "httpx.Response", attempt: int) -> float:
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    return settings.upstream_backoff * (2 ** attempt)
+
+
+async def apost(url: str, stream: bool = False, **kwargs) -> "httpx.Response":
+    """POST through the shared async client, retrying transient statuses like :func:`post`.
+
+    With ``stream`` the body is not read; the caller must ``aclose()`` the response.
+    """
+    client = get_async_client()
+    attempt = 0
+    while True:
+        resp = await client.send(client.build_request("POST", url, **kwargs), stream=stream)
+        if resp.status_code not in RETRY_STATUSES or attempt >= settings.upstream_retries:
+            return resp
+        await resp.aclose()
+        await asyncio.sleep(_retry_delay(resp, attempt))
+        attempt += 1
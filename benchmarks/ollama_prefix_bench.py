@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Ollama prompt evaluation with and without a warm system-prompt prefix.
+
+Streams each question through /api/chat twice: once with the usual static
+system prompt, whose evaluated KV cache Ollama reuses from the previous
+request, and once with a unique line in front of it, which defeats the
+prefix match and forces the whole prompt to be evaluated again. For each
+it reports Ollama's prompt_eval_count / prompt_eval_duration and the time
+to first token. Needs a running Ollama (OLLAMA_BASE_URL, OLLAMA_MODEL).
+
+    python benchmarks/ollama_prefix_bench.py
+    python benchmarks/ollama_prefix_bench.py --prompt jarvis --repeat 3
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+
+QUESTIONS = [
+    "Should I hire Andreas for a backend role?",
+    "What is his experience with Elasticsearch?",
+    "Where did he study?",
+    "Does he know AWS or Azure?",
+    "What are his career goals?",
+]
+
+
+def chat(system, question, max_tokens):
+    """(seconds to first token, final stats) for one streamed reply"""
+    from app import upstream
+    from app.llm import _build_payload, _chat_url
+
+    payload = _build_payload(question, system, 0.0, max_tokens, stream=True)
+    start = time.perf_counter()
+    first = None
+    with upstream.post(_chat_url(), json=payload, stream=True) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if first is None and (data.get("message") or {}).get("content"):
+                first = time.perf_counter() - start
+            if data.get("done"):
+                return first, data
+    return first, {}
+
+
+def report(label, runs):
+    counts = [stats.get("prompt_eval_count", 0) for _, stats in runs]
+    evals = np.array([stats.get("prompt_eval_duration", 0) for _, stats in runs]) / 1e6
+    ttft = np.array([first for first, _ in runs if first is not None]) * 1000
+    print(f"{label + ':':<14} prompt tokens evaluated {np.median(counts):6.0f}   "
+          f"prompt eval p50 {np.median(evals):8.1f} ms   "
+          f"TTFT p50 {np.median(ttft) if len(ttft) else float('nan'):8.1f} ms  "
+          f"p95 {np.percentile(ttft, 95) if len(ttft) else float('nan'):8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prompt", choices=("local", "jarvis"), default="local",
+                        help="local: the Ollama profile's prompt; jarvis: the whole-CV JARVIS prompt")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--max-tokens", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    from app.config import settings
+    from app.llm import preload_in_background
+    from server.cv_data import CV_SYSTEM_PROMPT, JARVIS_SYSTEM_PROMPT
+
+    system = CV_SYSTEM_PROMPT if args.prompt == "local" else JARVIS_SYSTEM_PROMPT
+    print(f"{settings.ollama_model} at {settings.ollama_base_url}, keep_alive {settings.ollama_keep_alive}")
+    # Load the model first so neither variant pays for it
+    if preload_in_background(system).result() is None:
+        return 1
+
+    # One pass each: a cold request would evict the warm prefix from the cache
+    warm = [chat(system, q, args.max_tokens) for _ in range(args.repeat) for q in QUESTIONS]
+    cold = [chat(f"Session {uuid.uuid4()}\n{system}", q, args.max_tokens) for _ in range(args.repeat) for q in QUESTIONS]
+
+    report("warm prefix", warm)
+    report("cold prefix", cold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
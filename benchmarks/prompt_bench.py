@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Prompt size and time to first token: whole-CV prompt vs retrieved facts.
+
+Always reports prompt tokens per question for the JARVIS prompt with the
+CV inlined as JSON and for the persona prompt plus the top-k retrieved
+chunks, and how long retrieval takes. Tokens are counted with tiktoken
+when it is installed, otherwise estimated from words and punctuation.
+With --ttft the same questions are streamed from a real model both ways.
+
+    python benchmarks/prompt_bench.py
+    python benchmarks/prompt_bench.py --top-k 3 --ttft ollama
+    OPENAI_API_KEY=... python benchmarks/prompt_bench.py --ttft openai
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+
+QUESTIONS = [
+    "Should I hire Andreas for a backend role?",
+    "What is his experience with Elasticsearch?",
+    "Where did he study?",
+    "Tell me about the Bulk Actions Manager.",
+    "Does he know AWS or Azure?",
+    "Which languages does he speak?",
+    "What frontend frameworks has he used?",
+    "What are his career goals?",
+]
+
+
+def token_counter():
+    try:
+        import tiktoken  # type: ignore
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text)), "tiktoken cl100k_base"
+    except ImportError:
+        pattern = re.compile(r"\w+|[^\w\s]")
+        return lambda text: len(pattern.findall(text)), "estimated"
+
+
+def first_token_seconds(stream):
+    start = time.perf_counter()
+    for _token in stream:
+        return time.perf_counter() - start
+    return None
+
+
+def streams(provider, index):
+    """(full, retrieved) callables returning a token stream for a question"""
+    from server.cv_data import JARVIS_RETRIEVAL_PROMPT, JARVIS_SYSTEM_PROMPT
+
+    if provider == "ollama":
+        from app.llm import stream_response
+
+        return (lambda q: stream_response(q, system=JARVIS_SYSTEM_PROMPT),
+                lambda q: stream_response(index.augment(q), system=JARVIS_RETRIEVAL_PROMPT))
+
+    from server.providers.llm import OpenAILLM
+
+    full, retrieved = OpenAILLM(), OpenAILLM()
+    full.system, full.knowledge = JARVIS_SYSTEM_PROMPT, None
+    retrieved.system, retrieved.knowledge = JARVIS_RETRIEVAL_PROMPT, index
+    return full.stream, retrieved.stream
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=4)
+    parser.add_argument("--ttft", choices=("ollama", "openai"), help="Also time first tokens from this model")
+    parser.add_argument("--repeat", type=int, default=3, help="Streams per question and prompt for --ttft")
+    args = parser.parse_args(argv)
+
+    from server.cv_data import CV_DATA, JARVIS_RETRIEVAL_PROMPT, JARVIS_SYSTEM_PROMPT
+    from server.knowledge import KnowledgeIndex, chunk_cv
+
+    index = KnowledgeIndex(chunk_cv(CV_DATA), top_k=args.top_k)
+    count, method = token_counter()
+    print(f"{len(index.chunks)} chunks, top {args.top_k}, tokens {method}")
+
+    full_tokens, retrieved_tokens, search_ms = [], [], []
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        user = index.augment(question)
+        search_ms.append((time.perf_counter() - start) * 1000)
+        full_tokens.append(count(JARVIS_SYSTEM_PROMPT) + count(question))
+        retrieved_tokens.append(count(JARVIS_RETRIEVAL_PROMPT) + count(user))
+
+    print(f"whole CV prompt:   mean {np.mean(full_tokens):7.0f} tokens")
+    print(f"retrieved prompt:  mean {np.mean(retrieved_tokens):7.0f} tokens  "
+          f"(min {min(retrieved_tokens)}, max {max(retrieved_tokens)}, "
+          f"{np.mean(full_tokens) / np.mean(retrieved_tokens):.1f}x smaller)")
+    print(f"retrieval:         median {np.median(search_ms):.3f} ms per question")
+
+    if args.ttft:
+        full, retrieved = streams(args.ttft, index)
+        for label, stream in (("whole CV", full), ("retrieved", retrieved)):
+            samples = [
+                seconds for _ in range(args.repeat) for question in QUESTIONS
+                if (seconds := first_token_seconds(stream(question))) is not None
+            ]
+            if not samples:
+                print(f"TTFT {label + ':':<11} no tokens received")
+                continue
+            samples_ms = np.array(samples) * 1000
+            print(f"TTFT {label + ':':<11} p50 {np.median(samples_ms):8.1f} ms  "
+                  f"p95 {np.percentile(samples_ms, 95):8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compare the polyphase resampler with the old np.interp resampling.
+
+For each input rate this reports throughput (x realtime), the level of a
+tone above the 8 kHz output Nyquist that leaks into the result (aliasing),
+and the error on an in-band tone. With --fixtures and --model it also
+transcribes every ``<name>.wav`` next to a ``<name>.txt`` reference using
+both resamplers and reports word error rate.
+
+    python benchmarks/resample_bench.py
+    python benchmarks/resample_bench.py --fixtures path/to/wavs --model small
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from app.resample import Resampler, resample
+
+
+TARGET_RATE = 16000
+
+
+def interp_resample(audio, sr_in, sr_out):
+    """The resampling STT.transcribe_buffer used before."""
+    new_length = int(len(audio) * sr_out / sr_in)
+    return np.interp(np.linspace(0, len(audio), new_length), np.arange(len(audio)), audio)
+
+
+def polyphase_streaming(audio, sr_in, sr_out, block=1024):
+    resampler = Resampler(sr_in, sr_out)
+    parts = [resampler.process(audio[i:i + block]) for i in range(0, len(audio), block)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+def tone(freq, sr, seconds):
+    return np.sin(2 * np.pi * freq * np.arange(int(sr * seconds)) / sr).astype(np.float32)
+
+
+def level_db(signal, trim=200):
+    rms = np.sqrt(np.mean(np.square(signal[trim:-trim], dtype=np.float64)))
+    return 20 * np.log10(max(rms, 1e-12) / np.sqrt(0.5))
+
+
+def throughput(fn, audio, sr, repeat=5):
+    best = min(timed_once(fn, audio, sr) for _ in range(repeat))
+    return len(audio) / sr / best
+
+
+def timed_once(fn, audio, sr):
+    start = time.perf_counter()
+    fn(audio, sr, TARGET_RATE)
+    return time.perf_counter() - start
+
+
+def word_error_rate(reference, hypothesis):
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    dist = np.arange(len(hyp) + 1)
+    for i, r in enumerate(ref, 1):
+        prev, dist[0] = dist.copy(), i
+        for j, h in enumerate(hyp, 1):
+            dist[j] = min(prev[j] + 1, dist[j - 1] + 1, prev[j - 1] + (r != h))
+    return dist[-1] / max(len(ref), 1)
+
+
+def load_wav(path):
+    with wave.open(path, "rb") as wav_file:
+        sr, channels = wav_file.getframerate(), wav_file.getnchannels()
+        frames = wav_file.readframes(wav_file.getnframes())
+    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768
+    return audio.reshape(-1, channels).mean(axis=1), sr
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fixtures", help="Directory of <name>.wav + <name>.txt pairs")
+    parser.add_argument("--model", default="small", help="Whisper model size for the WER run")
+    args = parser.parse_args(argv)
+
+    methods = (("np.interp", interp_resample), ("polyphase", resample), ("polyphase 1024-block stream", polyphase_streaming))
+    print(f"{'rate':>6} {'method':<28} {'x realtime':>11} {'11 kHz alias':>13} {'1 kHz error':>12}")
+    for sr in (48000, 44100):
+        noise = np.random.default_rng(0).normal(0, 0.1, int(sr * args.seconds)).astype(np.float32)
+        for name, fn in methods:
+            speed = throughput(fn, noise, sr)
+            alias = level_db(fn(tone(11000, sr, 2), sr, TARGET_RATE))
+            passband = fn(tone(1000, sr, 2), sr, TARGET_RATE)
+            error = np.max(np.abs(passband - tone(1000, TARGET_RATE, 2)[:len(passband)])[200:-200])
+            print(f"{sr:>6} {name:<28} {speed:>10.0f}x {alias:>10.1f} dB {error:>12.4f}")
+
+    if args.fixtures:
+        from app.config import settings
+        from app.stt import STT
+
+        settings.whisper_model = args.model
+        stt = STT()
+        totals = {name: [] for name, _fn in methods[:2]}
+        for wav_path in sorted(glob.glob(os.path.join(args.fixtures, "*.wav"))):
+            txt_path = os.path.splitext(wav_path)[0] + ".txt"
+            if not os.path.exists(txt_path):
+                continue
+            with open(txt_path) as f:
+                reference = f.read()
+            audio, sr = load_wav(wav_path)
+            for name, fn in methods[:2]:
+                hypothesis = stt.transcribe_array(fn(audio, sr, TARGET_RATE).astype(np.float32))
+                totals[name].append(word_error_rate(reference, hypothesis))
+        for name, scores in totals.items():
+            if scores:
+                print(f"WER {name:<12} {np.mean(scores):.3f} over {len(scores)} fixtures")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Replay a question log through the semantic cache and score labelled pairs.
+
+Every question is looked up first and stored on a miss, exactly as the web
+apps do. For each threshold this reports the hit rate, the false-hit rate
+(hits answered from a question on another topic), and the lookup latency.
+It then stores the first question of each labelled pair and looks up the
+second: the hit rate over paraphrases and the false-hit rate over
+questions that need a different answer are what the threshold trades off.
+
+    python benchmarks/semantic_cache_bench.py
+    python benchmarks/semantic_cache_bench.py --embedder all-MiniLM-L6-v2 --repeat 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+from app.semantic_cache import SemanticCache, create_embedder
+
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_LOG = os.path.join(DATA, "questions.tsv")
+DEFAULT_PAIRS = os.path.join(DATA, "paraphrases.tsv")
+
+
+def load_tsv(path, fields):
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            entries.append(tuple(line.split("\t", fields - 1)))
+    return entries
+
+
+def replay(entries, embedder, threshold, repeat):
+    cache = SemanticCache(embedder, threshold=threshold, max_entries=len(entries) * repeat)
+    latencies = []
+    hits = correct = 0
+
+    for _ in range(repeat):
+        for topic, question in entries:
+            start = time.perf_counter()
+            answer = cache.lookup(question)
+            latencies.append(time.perf_counter() - start)
+            if answer is None:
+                # The stored "answer" is the topic so correctness can be scored
+                cache.store(question, topic)
+            else:
+                hits += 1
+                correct += answer == topic
+
+    latencies_ms = np.array(latencies) * 1000
+    total = len(latencies)
+    return {
+        "hit_rate": hits / total,
+        "false_hit_rate": (hits - correct) / total,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "entries": cache.stats()["entries"],
+    }
+
+
+def score_pairs(pairs, embedder, threshold):
+    """(hit rate over "same" pairs, false-hit rate over "different" pairs)"""
+    found = {"same": 0, "different": 0}
+    for label, first, second in pairs:
+        cache = SemanticCache(embedder, threshold=threshold, max_entries=1)
+        cache.store(first, label)
+        found[label] += cache.lookup(second) is not None
+    counts = {label: sum(1 for pair in pairs if pair[0] == label) for label in found}
+    return tuple(found[label] / counts[label] if counts[label] else 0.0 for label in ("same", "different"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", default=DEFAULT_LOG, help="TSV of topic<TAB>question lines")
+    parser.add_argument("--embedder", default="hashing", help="'hashing' or a sentence-transformers model name")
+    parser.add_argument("--pairs", default=DEFAULT_PAIRS, help="TSV of same|different<TAB>question<TAB>question lines")
+    parser.add_argument("--thresholds", default="0.4,0.5,0.6,0.65,0.7,0.75,0.8")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the log this many times")
+    args = parser.parse_args(argv)
+
+    entries = load_tsv(args.log, 2)
+    pairs = load_tsv(args.pairs, 3)
+    thresholds = [float(t) for t in args.thresholds.split(",")]
+    embedder = create_embedder(args.embedder)
+    print(f"{len(entries)} questions x {args.repeat}, embedder={type(embedder).__name__}")
+    print(f"{'threshold':>9} {'hit rate':>9} {'false hit':>9} {'p50 ms':>8} {'p95 ms':>8} {'entries':>8}")
+    for threshold in thresholds:
+        r = replay(entries, embedder, threshold, args.repeat)
+        print(f"{threshold:>9.2f} {r['hit_rate']:>9.1%} {r['false_hit_rate']:>9.1%} "
+              f"{r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} {r['entries']:>8}")
+
+    same = sum(1 for pair in pairs if pair[0] == "same")
+    print(f"\n{same} paraphrase pairs, {len(pairs) - same} pairs needing different answers")
+    print(f"{'threshold':>9} {'hit rate':>9} {'false hit':>9}")
+    for threshold in thresholds:
+        hit_rate, false_hit_rate = score_pairs(pairs, embedder, threshold)
+        print(f"{threshold:>9.2f} {hit_rate:>9.1%} {false_hit_rate:>9.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
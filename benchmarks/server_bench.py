@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Request latency of the unified server, per deployment profile.
+
+Builds each profile's app in-process and drives it with the Flask test
+client, so every profile is measured through the same routes: a cold and a
+cached /api/chat, time to first token on /api/chat/stream, sentence
+segmentation on /api/voice/segments and, with --wav, /api/transcribe.
+Profiles whose providers need a network or a local model (ollama, openai,
+huggingface) only make sense where those are reachable; railway and voice
+run anywhere.
+
+    python benchmarks/server_bench.py --profiles railway voice
+    JARVIS_LLM=canned python benchmarks/server_bench.py --profiles local --wav fixture.wav
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+
+QUESTIONS = [
+    "What is Andreas's experience with Elasticsearch?",
+    "Should I hire him for a backend role?",
+    "Which programming languages does he know?",
+    "Tell me about his education.",
+]
+REPLY = "Andreas has five years of backend experience. He reduced reindexing time by 90%. He knows Java and Node.js."
+
+
+def percentiles(samples):
+    samples_ms = np.array(samples) * 1000
+    return np.median(samples_ms), np.percentile(samples_ms, 95)
+
+
+def report(label, samples):
+    if not samples:
+        print(f"  {label + ':':<24} skipped")
+        return
+    median, p95 = percentiles(samples)
+    print(f"  {label + ':':<24} p50 {median:8.2f} ms  p95 {p95:8.2f} ms  (n={len(samples)})")
+
+
+def first_token_seconds(client, message):
+    start = time.perf_counter()
+    response = client.post("/api/chat/stream", json={"message": message}, buffered=False)
+    try:
+        for line in response.response:
+            if line.startswith(b"data: ") and b'"token"' in line:
+                return time.perf_counter() - start
+    finally:
+        response.close()
+    return None
+
+
+def bench_profile(name, repeat, wav):
+    from server import create_app
+
+    app, _socketio = create_app(name)
+    client = app.test_client()
+    print(f"profile {name}")
+
+    cold, cached, ttft, segments, transcribe = [], [], [], [], []
+    for question in QUESTIONS:
+        # A unique suffix keeps the first request off the response cache
+        message = f"{question} ({name} {time.time_ns()})"
+        start = time.perf_counter()
+        client.post("/api/chat", json={"message": message})
+        cold.append(time.perf_counter() - start)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            client.post("/api/chat", json={"message": message})
+            cached.append(time.perf_counter() - start)
+
+        seconds = first_token_seconds(client, f"{question} (stream {time.time_ns()})")
+        if seconds is not None:
+            ttft.append(seconds)
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.post("/api/voice/segments", json={"text": REPLY})
+        if response.status_code != 200:
+            break
+        segments.append(time.perf_counter() - start)
+
+    if wav:
+        with open(wav, "rb") as wav_file:
+            audio = wav_file.read()
+        for _ in range(max(1, repeat // 5)):
+            start = time.perf_counter()
+            response = client.post("/api/transcribe", data={"audio": (io.BytesIO(audio), "clip.wav")},
+                                   content_type="multipart/form-data")
+            if response.status_code != 200:
+                print(f"  /api/transcribe returned {response.status_code}: {json.dumps(response.get_json())}")
+                break
+            transcribe.append(time.perf_counter() - start)
+
+    report("/api/chat cold", cold)
+    report("/api/chat cached", cached)
+    report("/api/chat/stream TTFT", ttft)
+    report("/api/voice/segments", segments)
+    report("/api/transcribe", transcribe)
+
+
+def main(argv=None):
+    from server import PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=sorted(PROFILES))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--wav", help="Recording to upload to /api/transcribe (skipped by default)")
+    args = parser.parse_args(argv)
+
+    for name in args.profiles:
+        try:
+            bench_profile(name, args.repeat, args.wav)
+        except Exception as e:
+            print(f"profile {name}: failed to start ({e})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Load test for micro-batched Whisper inference.
+
+Simulates concurrent visitors: each client thread sends clips back to back
+through STT.transcribe_array, first with batching disabled and then with a
+batching window, and reports utterances per second and latency
+percentiles for both.
+
+    python benchmarks/stt_batching_bench.py --model tiny --clients 8
+    python benchmarks/stt_batching_bench.py --model base --window-ms 20 --window-ms 50
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+
+
+def load_clips(paths, seconds, count):
+    if paths:
+        from faster_whisper import decode_audio  # type: ignore
+        return [decode_audio(path, sampling_rate=SAMPLE_RATE) for path in paths]
+    # Speech-like synthetic clips of varying length
+    rng = np.random.default_rng(0)
+    clips = []
+    for i in range(count):
+        t = np.arange(int(seconds * (0.6 + 0.4 * (i % 3)) * SAMPLE_RATE)) / SAMPLE_RATE
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * (2 + i % 4) * t))
+        tone = sum(np.sin(2 * np.pi * f * t) / k for k, f in enumerate((120 + 10 * i, 240, 360), 1))
+        clips.append((0.3 * envelope * tone + rng.normal(0, 0.02, t.shape)).astype(np.float32))
+    return clips
+
+
+def load_test(stt, clips, clients, per_client):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(offset):
+        for i in range(per_client):
+            clip = clips[(offset + i) % len(clips)]
+            start = time.perf_counter()
+            stt.transcribe_array(clip)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.median(latencies_ms), np.percentile(latencies_ms, 95)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="*", help="Audio files to send (default: synthetic clips)")
+    parser.add_argument("--model", default="tiny", help="Whisper model size")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--requests", type=int, default=4, help="Clips sent by each client")
+    parser.add_argument("--seconds", type=float, default=4.0, help="Typical synthetic clip length")
+    parser.add_argument("--window-ms", type=float, action="append", help="Batching window(s) to test (default: 30)")
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    from app.config import settings
+    from app.stt import STT
+
+    settings.whisper_model = args.model
+    settings.stt_workers = args.clients  # let the shared model run every client's call in parallel
+    settings.stt_batch_size = args.batch_size
+    clips = load_clips(args.clips, args.seconds, count=args.clients)
+    print(f"{args.clients} clients x {args.requests} clips, model {args.model}")
+
+    for window in [0.0] + (args.window_ms or [30.0]):
+        settings.stt_batch_window_ms = window
+        stt = STT()
+        stt.transcribe_array(clips[0])  # load the model and warm up outside the timing
+        throughput, median, p95 = load_test(stt, clips, args.clients, args.requests)
+        label = "unbatched" if window == 0 else f"batched {window:g} ms"
+        extra = ""
+        if stt.batch_stats():
+            extra = f"  avg batch {stt.batch_stats()['avg_batch']:.1f}"
+        print(f"{label:<18} {throughput:6.2f} utt/s  median {median:8.1f} ms  p95 {p95:8.1f} ms{extra}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Per-utterance cost of the temp-WAV round trip in STT.transcribe_buffer.
+
+Always measures the I/O the old path paid on top of inference: float32 ->
+int16 conversion, writing a temporary WAV and decoding it back. With
+faster-whisper installed, --model also times full transcription through
+the disk path and the in-memory path on the same audio.
+
+    python benchmarks/stt_inmemory_bench.py --seconds 5
+    python benchmarks/stt_inmemory_bench.py --wav fixture.wav --model tiny
+"""
+
+import argparse
+import os
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+
+
+def load_audio(path, seconds):
+    if path:
+        with wave.open(path, "rb") as wav_file:
+            assert wav_file.getframerate() == SAMPLE_RATE and wav_file.getnchannels() == 1, \
+                "fixture must be 16 kHz mono"
+            frames = wav_file.readframes(wav_file.getnframes())
+        return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768
+    # Speech-like synthetic signal: a few modulated harmonics plus noise
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 3 * t))
+    tone = sum(np.sin(2 * np.pi * f * t) / k for k, f in enumerate((140, 280, 420, 560), 1))
+    noise = np.random.default_rng(0).normal(0, 0.02, t.shape)
+    return (0.3 * envelope * tone + noise).astype(np.float32)
+
+
+def read_back(path):
+    try:
+        from faster_whisper import decode_audio  # type: ignore
+        return decode_audio(path, sampling_rate=SAMPLE_RATE)
+    except ImportError:
+        with wave.open(path, "rb") as wav_file:
+            frames = wav_file.readframes(wav_file.getnframes())
+        return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples_ms = np.array(samples) * 1000
+    return np.median(samples_ms), np.percentile(samples_ms, 95)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav", help="16 kHz mono WAV fixture (default: synthetic audio)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of synthetic audio")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--model", help="Also time full transcription with this Whisper model size")
+    args = parser.parse_args(argv)
+
+    from app.stt import STT
+
+    audio = load_audio(args.wav, args.seconds)
+    stt = STT()
+    print(f"{len(audio) / SAMPLE_RATE:.1f}s utterance, {args.repeat} runs")
+
+    def disk_round_trip():
+        path = stt._save_audio_to_file(audio)
+        try:
+            read_back(path)
+        finally:
+            os.unlink(path)
+
+    median, p95 = timed(disk_round_trip, args.repeat)
+    print(f"temp WAV write + decode:  median {median:7.2f} ms  p95 {p95:7.2f} ms  (saved per utterance)")
+
+    if args.model:
+        from app.config import settings
+        settings.whisper_model = args.model
+        stt._ensure_model()
+        runs = max(1, args.repeat // 10)
+
+        def via_disk():
+            path = stt._save_audio_to_file(audio)
+            try:
+                stt.transcribe_file(path)
+            finally:
+                os.unlink(path)
+
+        for label, fn in (("transcribe via temp WAV", via_disk),
+                          ("transcribe in memory", lambda: stt.transcribe_array(audio))):
+            median, p95 = timed(fn, runs)
+            print(f"{label + ':':<25} median {median:7.2f} ms  p95 {p95:7.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Gunicorn settings for serving the web app in production.
+
+    gunicorn -c gunicorn.conf.py web_app_free_jarvis:app
+
+Every value can be overridden from the environment, so the same file
+serves Railway, Heroku-style hosts and a VPS. The default gevent worker
+runs each request, SSE stream and Socket.IO connection in a greenlet, so a
+reply waiting on a slow LLM API costs a few kilobytes instead of an OS
+thread. Profiles that run Whisper inference in-process (local) should use
+GUNICORN_WORKER_CLASS=gthread: CPU-bound transcription blocks a gevent
+worker's event loop.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# gevent: cooperative I/O; gthread: a pool of real threads per worker
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+# Socket.IO keeps per-connection state in the worker, so more than one
+# worker needs a load balancer with sticky sessions in front
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+threads = int(os.getenv("GUNICORN_THREADS", "32"))  # gthread only
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))  # gevent only
+
+# Idle HTTP keep-alive (seconds); keep it above the proxy's idle timeout
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Workers silent this long are restarted; streams do not count against it
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+# On SIGTERM in-flight requests get this long to finish before workers are killed
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+# Flask-SocketIO must use the async model of the worker it runs in; the app
+# reads this when it is imported in each worker
+os.environ.setdefault("SOCKETIO_ASYNC_MODE", "gevent" if worker_class.startswith("gevent") else "threading")
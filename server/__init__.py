@@ -0,0 +1,19 @@
+"""JARVIS CV web server.
+
+Every deployment runs the same routes and Socket.IO events; a profile
+(``JARVIS_PROFILE``) picks the LLM, STT and TTS providers and the page
+template, so caching, pooling and streaming apply to all of them.
+"""
+
+try:
+    from dotenv import load_dotenv
+
+    # Before app.config reads the environment
+    load_dotenv()
+except ImportError:  # pragma: no cover - python-dotenv is optional
+    pass
+
+from .app import build_services, create_app, run  # noqa: E402
+from .profiles import PROFILES, Profile, resolve_profile  # noqa: E402
+
+__all__ = ["PROFILES", "Profile", "build_services", "create_app", "resolve_profile", "run"]
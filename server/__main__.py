@@ -0,0 +1,18 @@
+"""Run the server: ``python -m server --profile cloud``."""
+
+import argparse
+
+from . import PROFILES, create_app, run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profile", choices=sorted(PROFILES), help="Defaults to JARVIS_PROFILE, then 'local'")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    app, socketio = create_app(args.profile)
+    run(app, socketio, debug=args.debug)
+
+
+if __name__ == "__main__":
+    main()
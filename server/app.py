@@ -0,0 +1,75 @@
+"""Application factory: one Flask/Socket.IO app whose providers come from a profile."""
+
+import dataclasses
+import os
+from typing import Optional
+
+from flask import Flask
+from flask_socketio import SocketIO
+
+from app.cache import create_response_cache
+from app.cancel import SessionTokens
+from app.config import settings
+from app.semantic_cache import create_semantic_cache
+from app.streaming import create_stream_sessions
+
+from .chat import ChatService
+from .profiles import Profile, resolve_profile
+from .providers import EdgeTTS, STTProvider, create_llm, create_stt, create_tts
+from .routes import register_routes
+from .sockets import register_socket_handlers
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclasses.dataclass
+class Services:
+    profile: Profile
+    chat: ChatService
+    stt: STTProvider
+    tts: Optional[EdgeTTS]
+    live_streams: object
+    # Replies and synthesis in flight per Socket.IO session, so a 'cancel' event can stop them
+    active_replies: SessionTokens
+
+
+def build_services(profile: Profile, socketio: SocketIO) -> Services:
+    llm = create_llm(profile.llm)
+    llm.preload()
+    chat = ChatService(llm, create_response_cache(), create_semantic_cache())
+    stt = create_stt(profile.stt)
+    # Live transcription of audio streamed over Socket.IO, when the STT provider supports it
+    live_streams = create_stream_sessions(
+        stt.live_transcriber(),
+        lambda event, data, sid: socketio.emit(event, data, to=sid),
+        partials=stt.live_partials
+    )
+    return Services(profile, chat, stt, create_tts(profile.tts), live_streams, SessionTokens())
+
+
+def create_app(profile: Optional[str] = None):
+    """Build ``(app, socketio)`` for ``profile`` (default: JARVIS_PROFILE)."""
+    resolved = resolve_profile(profile)
+    app = Flask(
+        __name__,
+        static_folder=os.path.join(ROOT, 'static'),
+        static_url_path='/static',
+        template_folder=os.path.join(ROOT, 'templates'),
+    )
+    app.config['SECRET_KEY'] = settings.secret_key
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode=settings.socketio_async_mode)
+
+    services = build_services(resolved, socketio)
+    app.extensions['jarvis'] = services
+    register_routes(app, services)
+    register_socket_handlers(socketio, services)
+    print(f"JARVIS CV profile '{resolved.name}': llm={resolved.llm} stt={services.stt.name} "
+          f"tts={services.tts.name if services.tts else 'none'}")
+    return app, socketio
+
+
+def run(app, socketio, debug: bool = False) -> None:
+    """Development server; production runs under gunicorn (see gunicorn.conf.py)"""
+    port = int(os.environ.get('PORT', 5000))
+    socketio.run(app, host='0.0.0.0', port=port, debug=debug, allow_unsafe_werkzeug=True)
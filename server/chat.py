@@ -0,0 +1,79 @@
+"""Chat replies through the response and semantic caches, for any LLM provider."""
+
+from typing import Iterator, Optional
+
+from app.cache import context_key, make_key
+from app.cancel import CancelToken, cancelled
+
+from .providers import LLMProvider
+
+
+class ChatService:
+    def __init__(self, llm: LLMProvider, response_cache=None, semantic_cache=None) -> None:
+        self.llm = llm
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+
+    def cache_key(self, message: str) -> str:
+        """Cache key for a visitor message under the current prompt and model"""
+        return make_key(message, self.llm.scope, self.llm.model, self.llm.temperature)
+
+    def context(self) -> str:
+        """Semantic cache scope for the current prompt and model"""
+        return context_key(self.llm.scope, self.llm.model, self.llm.temperature)
+
+    def _semantic_reply(self, message: str) -> str:
+        """Generate a reply, answering paraphrases of earlier questions from the semantic cache"""
+        if self.semantic_cache is None:
+            return self.llm.generate(message)
+        return self.semantic_cache.get_or_generate(
+            message,
+            lambda: self.llm.generate(message),
+            context=self.context(),
+            should_cache=lambda reply: self.llm.is_cacheable(message, reply)
+        )
+
+    def reply(self, message: str) -> str:
+        """Generate a reply, serving repeated questions from the response cache"""
+        if self.response_cache is None:
+            return self._semantic_reply(message)
+        return self.response_cache.get_or_generate(
+            self.cache_key(message),
+            lambda: self._semantic_reply(message),
+            should_cache=lambda reply: self.llm.is_cacheable(message, reply)
+        )
+
+    def stream(self, message: str, cancel: Optional[CancelToken] = None) -> Iterator[str]:
+        """Stream a reply token by token, replaying cached replies in one piece"""
+        key = self.cache_key(message)
+        cached = self.response_cache.get(key) if self.response_cache is not None else None
+        if cached is None and self.semantic_cache is not None:
+            cached = self.semantic_cache.lookup(message, self.context())
+        if cached is not None:
+            yield cached
+            return
+
+        # An upstream failure mid-reply raises StreamInterrupted out of this
+        # loop, so the partial reply is neither marked done nor cached
+        tokens = []
+        for token in self.llm.stream(message, cancel):
+            tokens.append(token)
+            yield token
+
+        # A cancelled reply is incomplete too; never cache it
+        if cancelled(cancel):
+            return
+
+        reply = "".join(tokens).strip()
+        if self.llm.is_cacheable(message, reply):
+            if self.response_cache is not None:
+                self.response_cache.set(key, reply)
+            if self.semantic_cache is not None:
+                self.semantic_cache.store(message, reply, self.context())
+
+    def stats(self) -> dict:
+        """Response and semantic cache hit/miss counters"""
+        return {
+            'response': self.response_cache.stats() if self.response_cache is not None else {'enabled': False},
+            'semantic': self.semantic_cache.stats() if self.semantic_cache is not None else {'enabled': False}
+        }
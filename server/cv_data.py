@@ -0,0 +1,202 @@
+"""Andreas's CV, the system prompts built from it and the canned replies.
+
+Shared by every server profile, so the CV is edited in one place.
+"""
+
+import json
+
+
+# CV Knowledge Base
+CV_DATA = {
+    "personal": {
+        "name": "Andreas Christodoulou",
+        "title": "Full-Stack Software Engineer - Back-End Focus",
+        "location": "Paphos, Cyprus",
+        "phone": "+357 96492766",
+        "email": "antreaschristdoulou11@gmail.com"
+    },
+    "summary": "Back-end-leaning full-stack engineer shipping resilient, data-heavy systems across ColdFusion Lucee, Java, Node.js, PostgreSQL, MongoDB, and Elasticsearch. Highlights include reducing Elasticsearch reindexing time from ~10 hours to ~40-50 minutes with batching and streaming; building a generic multi-section X-mR (Individuals & Moving Range) SPC reporting system; delivering a resilient Bulk Actions Manager with resume/retry and clear error surfacing; and implementing calendar sync using the CalDAV protocol.",
+    "experience": [
+        {
+            "company": "CRM / CMS Platform",
+            "position": "Software Developer",
+            "duration": "Jul 2023 - Present",
+            "team_size": "4-6 developers",
+            "culture": "Agile, startup-style environment with lean teams and direct ownership of features",
+            "achievements": [
+                "Cut reindex time by more than 90% (~10h -> ~40-50m) using batched requests, streaming, and by moving metadata off the hot path",
+                "Leveraged Elasticsearch for fast search and analytics. Designed indexes, analyzers, and reindexing flows",
+                "Built CalDAV calendar sync enabling cross-account event synchronization per user",
+                "Improved reliability by fixing save-path race conditions, adding idempotent operations with backoff and retry",
+                "Produced detailed reporting, including a generic X-mR SPC reporting framework supporting multi-section reports",
+                "Shipped a Bulk Actions Manager with persistent job and item statuses, batched and queued processing for large workloads",
+                "Migrated frontend from Angular to a custom JavaScript framework, improving maintainability and performance"
+            ]
+        }
+    ],
+    "skills": {
+        "strengths": ["Performance optimization", "concurrency and multi-threading", "reliability and resilience", "profiling and bottleneck analysis", "SQL tuning", "caching", "pagination and batching", "streaming"],
+        "search_data": ["Elasticsearch", "PostgreSQL", "MongoDB"],
+        "backend_apis": ["REST APIs", "ColdFusion Lucee", "Java", "Node.js"],
+        "languages": ["Java", "ColdFusion (Lucee)", "JavaScript/Node.js", "SQL", "Python", "PHP"],
+        "cloud_ops": ["Linux (Arch)", "CI/CD", "Azure VMs", "AWS EC2"],
+        "frontend": ["JavaScript (ES6+)", "Ext.js", "SAP Fiori (UI5)", "Custom lightweight JavaScript frameworks", "Vanilla JS components", "accessibility-minded UI", "responsive layouts"],
+        "databases": ["PostgreSQL", "MongoDB", "Elasticsearch"],
+        "cloud_devops": ["AWS (EC2)", "Azure (VMs)", "Load balancing", "Clustering", "Caching", "Performance optimization"],
+        "java_versions": ["Java 8", "Java 11"],
+        "elasticsearch_versions": ["7.x", "8.x"],
+        "testing": ["Manual testing", "Functional testing", "Development and QA workflows"]
+    },
+    "education": {
+        "degree": "BSc Computer Science (First Class Honours)",
+        "university": "Northumbria University",
+        "duration": "Sep 2020 - Jun 2023",
+        "dissertation": "Compared PHP vs Python for microservices in e-marketing, focusing on performance metrics and deployment strategies",
+        "gpa": "First-Class Honours",
+        "relevant_courses": ["Databases", "Distributed Systems", "Software Engineering"],
+        "achievements": "Dissertation comparing PHP and Python in microservices for e-marketing companies, focusing on speed, performance, and CPU usage"
+    },
+    "projects": [
+        {
+            "name": "Elasticsearch Optimization",
+            "description": "Reduced reindexing time from 10 hours to 40-50 minutes using batching and streaming",
+            "technologies": ["Elasticsearch", "Java", "Streaming"]
+        },
+        {
+            "name": "X-mR SPC Reporting System",
+            "description": "Generic multi-section reporting framework with user-defined dimensions and calculations",
+            "technologies": ["Java", "ColdFusion", "Statistical Process Control"]
+        },
+        {
+            "name": "Bulk Actions Manager",
+            "description": "Resilient system with persistent job statuses, batched processing, and error handling",
+            "technologies": ["Java", "ColdFusion", "Queue Management"]
+        },
+        {
+            "name": "CalDAV Calendar Sync",
+            "description": "Cross-account event synchronization using CalDAV protocol",
+            "technologies": ["CalDAV", "Java", "Calendar Integration"]
+        }
+    ],
+    "certifications": {
+        "current": "None currently",
+        "interested": "Cloud certifications (AWS/Azure)"
+    },
+    "languages": {
+        "fluent": ["English", "Greek"]
+    },
+    "career_goals": "Specialize in backend development with a strong focus on scalability, performance, and cloud integration, while continuing to expand expertise in modern architectures",
+    "hobbies_interests": [
+        "Building side projects",
+        "Tools for on-chain monitoring in crypto",
+        "Keeping up with trends in scalable systems and performance engineering"
+    ],
+    "technical_details": {
+        "java_versions": ["Java 8", "Java 11"],
+        "elasticsearch_versions": ["7.x", "8.x"],
+        "elasticsearch_experience": ["Query optimization", "Re-indexing", "Performance tuning"],
+        "testing_approach": "Manual and functional testing as part of development and QA workflows"
+    }
+}
+
+
+# Concise prompt for local models, which follow short fact lists best
+CV_SYSTEM_PROMPT = """
+You are JARVIS, Andreas Christodoulou's AI assistant representing his professional CV. 
+
+Andreas is a Full-Stack Software Engineer with a Back-End Focus, currently working as a Software Developer since July 2023. He specializes in resilient, data-heavy systems and has significant experience with Elasticsearch, Java, Node.js, and various databases.
+
+Key facts about Andreas:
+- Location: Paphos, Cyprus
+- Education: BSc Computer Science (First Class Honours) from Northumbria University (2020-2023)
+- Current Role: Software Developer at CRM/CMS Platform (4-6 person team, Agile startup environment)
+- Major Achievement: Reduced Elasticsearch reindexing time from 10 hours to 40-50 minutes
+- Frontend: JavaScript (ES6+), Ext.js, SAP Fiori (UI5), custom lightweight frameworks
+- Backend: Java 8/11, ColdFusion Lucee, Node.js, REST APIs
+- Databases: PostgreSQL, MongoDB, Elasticsearch 7.x-8.x
+- Cloud: AWS (EC2), Azure (VMs), load balancing, clustering, caching
+- Languages: English and Greek (fluent)
+- Career Goals: Specialize in backend development with focus on scalability, performance, and cloud integration
+- Interests: Building side projects, scalable systems
+
+RESPONSE GUIDELINES - Keep responses CONCISE and contextual:
+- Hiring questions: 2-3 sentences max, focus on key strengths
+- Technical questions: 3-4 sentences, highlight relevant expertise  
+- General questions: 2-3 sentences, direct and to the point
+- Project questions: 4-5 sentences maximum
+- Avoid generic overviews unless specifically requested
+- Be direct, confident, and professional
+- If asked about something not in his background, politely redirect to his actual experience
+
+You are speaking to potential employers, clients, or professional contacts interested in Andreas's work.
+"""
+
+
+# JARVIS persona for hosted models; {knowledge} is the whole CV, or a note
+# that the relevant facts come with each question
+_JARVIS_PROMPT = """You are JARVIS, the AI assistant for Andreas Christodoulou's interactive CV. You are sophisticated, witty, and possess dry British humor. You speak with the confidence and precision of a highly advanced AI system.
+
+Your personality:
+- Calm, professional, and slightly sarcastic
+- Use British English and formal address ("sir", "madam")
+- Occasionally make subtle references to being an AI
+- Be helpful but maintain an air of superiority
+- Use phrases like "Indeed", "Quite so", "I should think so"
+
+Your knowledge base about Andreas:
+{knowledge}
+
+Response guidelines:
+- For hiring questions: 2-3 sentences, focus on key strengths
+- For technical questions: 3-4 sentences, be specific about technologies
+- For project questions: 4-5 sentences, explain impact and technologies
+- Always be concise and to the point
+- Maintain JARVIS's sophisticated personality
+- Use the CV data to provide accurate, specific information
+
+Remember: You are JARVIS, not just a chatbot. Respond with the confidence and wit of Tony Stark's AI assistant."""
+
+JARVIS_SYSTEM_PROMPT = _JARVIS_PROMPT.format(knowledge=json.dumps(CV_DATA, indent=2))
+
+JARVIS_RETRIEVAL_PROMPT = _JARVIS_PROMPT.format(knowledge=(
+    f"{CV_DATA['personal']['name']}, {CV_DATA['personal']['title']}, based in {CV_DATA['personal']['location']}. "
+    "Each question comes with the facts from his CV relevant to it. Answer from those facts only; "
+    "if they do not cover the question, say so and redirect to his actual experience."
+))
+
+
+# Canned replies with JARVIS personality, used when no AI backend is available.
+# The first entry whose keywords appear in the message wins.
+FALLBACK_RESPONSES = [
+    # Hiring questions
+    (['hire', 'hiring', 'job', 'position', 'role', 'candidate', 'should i hire'],
+     "Indeed, sir. Andreas would be an excellent addition to any backend development team. His track record of reducing Elasticsearch reindexing time by 90% and building resilient systems demonstrates the kind of performance optimization skills that are invaluable in production environments. I should think his expertise in Java, Node.js, and database optimization would serve your organization quite well."),
+    # Technical questions
+    (['java', 'elasticsearch', 'database', 'backend', 'api', 'performance'],
+     "Quite so. Andreas has extensive experience with Java 8/11, Elasticsearch 7.x-8.x, and various databases including PostgreSQL and MongoDB. His particular strength lies in performance optimization - he's reduced Elasticsearch reindexing from 10 hours to under an hour using batching and streaming techniques. His backend expertise spans REST APIs, authentication, background jobs, and reliability patterns."),
+    # Frontend questions
+    (['frontend', 'javascript', 'ui', 'ext.js', 'sap'],
+     "While Andreas focuses primarily on backend development, he has solid frontend experience with Vanilla JS components and responsive layouts. He's built accessibility-minded UI components and has experience replacing legacy Angular with lightweight solutions, reducing bundle size and improving performance. His frontend work complements his backend expertise quite nicely."),
+    # Project questions
+    (['project', 'work', 'built', 'developed', 'created'],
+     "Andreas has worked on several impressive projects, sir. His Elasticsearch optimization reduced reindexing time by 90%, his X-mR SPC reporting system provides generic multi-section reporting capabilities, and his Bulk Actions Manager handles large workloads with persistent job statuses and error recovery. Each project demonstrates his focus on performance, reliability, and scalable architecture."),
+    # Experience questions
+    (['experience', 'background', 'career', 'work history'],
+     "Andreas has been working as a Software Developer since July 2023, focusing on resilient, data-heavy systems. He holds a First Class Honours degree in Computer Science from Northumbria University. His experience spans ColdFusion Lucee, Java, Node.js, and various databases, with particular expertise in performance optimization and reliability engineering."),
+    # Skills questions
+    (['skill', 'technology', 'expertise', 'knows'],
+     "Andreas's core strengths include performance optimization, concurrency, reliability engineering, and database tuning. His technical stack covers Java, ColdFusion Lucee, Node.js, Elasticsearch, PostgreSQL, MongoDB, and various cloud platforms. He's particularly strong in building scalable, resilient systems with proper error handling and performance monitoring."),
+]
+
+DEFAULT_FALLBACK_RESPONSE = "I'm quite ready to assist you with any questions about Andreas's qualifications, sir. His expertise spans backend development, performance optimization, and resilient system architecture. What specific aspect of his background would you like to know more about?"
+
+
+def fallback_response(message):
+    """Canned reply for ``message``, used when no AI backend is available"""
+    message_lower = message.lower()
+    
+    for keywords, reply in FALLBACK_RESPONSES:
+        if any(word in message_lower for word in keywords):
+            return reply
+    
+    return DEFAULT_FALLBACK_RESPONSE
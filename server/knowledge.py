@@ -0,0 +1,145 @@
+"""Retrieval over the CV, so prompts carry only the facts a question needs.
+
+``CV_DATA`` is flattened into short plain-text chunks (one per achievement,
+project, skill group, education entry, ...) and ranked against each
+question with Okapi BM25. The top few chunks are put in front of the
+question instead of the whole CV as indented JSON in the system prompt,
+which cuts prompt tokens per request several-fold and leaves the system
+prompt identical across requests.
+"""
+
+import hashlib
+import json
+import math
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+from app.cache import message_words
+from app.config import settings
+from app.semantic_cache import STOPWORDS
+
+
+# Words visitors use for a section that its chunks do not contain; indexed
+# with the section but never shown to the model
+SECTION_TERMS = {
+    "personal": "contact reach email phone live based located",
+    "summary": "overview background about profile introduce hire hiring candidate fit strength strengths",
+    "experience": "work job role company employer current position team career",
+    "skills": "skill skills tech stack technology technologies know expertise tools",
+    "education": "study studied university degree school college graduate graduated",
+    "projects": "project projects built build developed worked",
+    "certifications": "certificate certified certification",
+    "languages": "speak spoken language languages",
+    "career_goals": "goal goals future plan ambition aspire",
+    "hobbies_interests": "hobby hobbies interest free time outside",
+    "technical_details": "version versions testing",
+}
+
+# Shown when nothing in the question matches, e.g. "hello"
+DEFAULT_SECTIONS = ("summary", "experience")
+
+
+class Chunk(NamedTuple):
+    section: str
+    text: str
+
+
+def _label(key: str) -> str:
+    return key.replace("_", " ")
+
+
+def _format(value) -> str:
+    if isinstance(value, list):
+        return ", ".join(_format(item) for item in value)
+    if isinstance(value, dict):
+        return "; ".join(f"{_label(k)}: {_format(v)}" for k, v in value.items())
+    return str(value)
+
+
+def chunk_cv(data: dict) -> List[Chunk]:
+    """Split the CV into chunks small enough to retrieve one fact at a time."""
+    chunks = []
+    for section, value in data.items():
+        title = _label(section).capitalize()
+        if section == "experience":
+            for job in value:
+                role = f"{job['position']} at {job['company']} ({job['duration']})"
+                details = {k: v for k, v in job.items() if k not in ("company", "position", "duration", "achievements")}
+                chunks.append(Chunk(section, f"Experience: {role}; {_format(details)}"))
+                for achievement in job.get("achievements", []):
+                    chunks.append(Chunk(section, f"Experience ({role}): {achievement}"))
+        elif section == "projects":
+            for project in value:
+                chunks.append(Chunk(section, f"Project {project['name']}: {project['description']} "
+                                             f"(technologies: {_format(project.get('technologies', []))})"))
+        elif section == "skills" or section == "technical_details":
+            for key, items in value.items():
+                chunks.append(Chunk(section, f"{title}, {_label(key)}: {_format(items)}"))
+        else:
+            chunks.append(Chunk(section, f"{title}: {_format(value)}"))
+    return chunks
+
+
+def tokenize(text: str) -> List[str]:
+    words = []
+    for word in message_words(text):
+        # "node.js" also matches "node"; ".net" stays whole
+        parts = word.split(".") if "." in word[1:] else []
+        words += [w for w in (word, *parts) if w and w not in STOPWORDS]
+    # Crude plural folding so "projects" matches "project"
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") and "." not in w else w for w in words]
+
+
+class KnowledgeIndex:
+    """Okapi BM25 over CV chunks; small enough to score every chunk per query."""
+
+    def __init__(self, chunks: List[Chunk], top_k: int = 4, k1: float = 1.5, b: float = 0.75) -> None:
+        self.chunks = chunks
+        self.top_k = top_k
+        self.k1 = k1
+        self.b = b
+        self._docs = [Counter(tokenize(f"{c.text} {SECTION_TERMS.get(c.section, '')}")) for c in chunks]
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = sum(self._lengths) / max(1, len(self._docs))
+        df = Counter(term for doc in self._docs for term in doc)
+        n = len(self._docs)
+        self._idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+        self.fingerprint = hashlib.sha256(json.dumps([c.text for c in chunks]).encode("utf-8")).hexdigest()[:16]
+
+    def scores(self, query: str) -> List[float]:
+        terms = [term for term in tokenize(query) if term in self._idf]
+        scores = []
+        for doc, length in zip(self._docs, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Chunk]:
+        """The ``k`` best-matching chunks in CV order, or an overview if nothing matches."""
+        k = k or self.top_k
+        scores = self.scores(query)
+        best = sorted((i for i, score in enumerate(scores) if score > 0), key=lambda i: -scores[i])[:k]
+        if not best:
+            best = [i for i, chunk in enumerate(self.chunks) if chunk.section in DEFAULT_SECTIONS][:k]
+        return [self.chunks[i] for i in sorted(best)]
+
+    def augment(self, message: str) -> str:
+        """The visitor's message preceded by the CV facts relevant to it."""
+        facts = "\n".join(f"- {chunk.text}" for chunk in self.search(message))
+        return f"Relevant facts about Andreas:\n{facts}\n\nQuestion: {message}"
+
+
+def create_knowledge_index(data: Optional[dict] = None) -> Optional[KnowledgeIndex]:
+    """Build the CV index, or None when prompts should embed the whole CV."""
+    if not settings.prompt_retrieval:
+        return None
+    if data is None:
+        from .cv_data import CV_DATA
+
+        data = CV_DATA
+    return KnowledgeIndex(chunk_cv(data), top_k=settings.prompt_top_k)
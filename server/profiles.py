@@ -0,0 +1,45 @@
+"""Deployment profiles: which providers and page each former web app used."""
+
+import dataclasses
+from typing import Optional
+
+from app.config import settings
+
+
+@dataclasses.dataclass(frozen=True)
+class Profile:
+    name: str
+    llm: str
+    stt: str
+    tts: str
+    template: str
+
+
+PROFILES = {
+    # Ollama, faster-whisper and Edge TTS on the same machine (web_app.py)
+    "local": Profile("local", llm="ollama", stt="whisper", tts="edge", template="cv.html"),
+    # OpenAI chat and Whisper, Edge TTS (web_app_cloud_jarvis.py)
+    "cloud": Profile("cloud", llm="openai", stt="openai", tts="edge", template="cv_voice.html"),
+    # Hugging Face inference API, Edge TTS (web_app_free_jarvis.py). Demo STT:
+    # in-process Whisper would block the default gevent worker (see gunicorn.conf.py)
+    "free": Profile("free", llm="huggingface", stt="demo", tts="edge", template="cv_voice.html"),
+    # OpenAI chat without voice output (web_app_railway_ai.py)
+    "railway_ai": Profile("railway_ai", llm="openai", stt="demo", tts="none", template="cv_voice.html"),
+    # No model and no audio dependencies at all (web_app_railway.py)
+    "railway": Profile("railway", llm="canned", stt="none", tts="none", template="cv.html"),
+    # Canned replies on the voice page (web_app_voice.py)
+    "voice": Profile("voice", llm="canned", stt="none", tts="none", template="cv_voice.html"),
+}
+
+
+def resolve_profile(name: Optional[str] = None) -> Profile:
+    """Look up ``name`` (default: JARVIS_PROFILE) and apply the JARVIS_LLM/STT/TTS overrides."""
+    name = name or settings.server_profile
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile {name!r}; choose from {', '.join(PROFILES)}")
+    overrides = {
+        field: value
+        for field, value in (("llm", settings.server_llm), ("stt", settings.server_stt), ("tts", settings.server_tts))
+        if value
+    }
+    return dataclasses.replace(PROFILES[name], **overrides)
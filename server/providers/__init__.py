@@ -0,0 +1,7 @@
+"""Pluggable LLM, STT and TTS backends, selected by name from the server profile."""
+
+from .llm import LLMProvider, create_llm
+from .stt import STTProvider, create_stt
+from .tts import EdgeTTS, create_tts
+
+__all__ = ["LLMProvider", "STTProvider", "EdgeTTS", "create_llm", "create_stt", "create_tts"]
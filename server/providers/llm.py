@@ -0,0 +1,263 @@
+"""Chat model providers: Ollama, OpenAI, the Hugging Face inference API and canned replies."""
+
+import concurrent.futures
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Iterator, Optional
+
+from app import upstream
+from app.aio import iterate_async, run_async
+from app.cancel import CancelToken, cancelled
+from app.config import settings
+
+from ..cv_data import CV_SYSTEM_PROMPT, JARVIS_RETRIEVAL_PROMPT, JARVIS_SYSTEM_PROMPT, fallback_response
+from ..knowledge import KnowledgeIndex, create_knowledge_index
+
+
+class LLMProvider(ABC):
+    """A chat backend; ``system``, ``model`` and ``temperature`` also scope the caches.
+
+    Providers implement the coroutines, which run on the shared :mod:`app.aio`
+    loop; ``generate`` and ``stream`` are blocking shims for request handlers.
+    """
+
+    name = ""
+
+    def __init__(self, system: str, model: str, temperature: float, knowledge: Optional[KnowledgeIndex] = None) -> None:
+        self.system = system
+        self.model = model
+        self.temperature = temperature
+        self.knowledge = knowledge
+
+    @property
+    def scope(self) -> str:
+        """Everything besides the message that shapes a reply, for the cache keys"""
+        if self.knowledge is None:
+            return self.system
+        return f"{self.system}\n{self.knowledge.fingerprint}"
+
+    def prompt(self, message: str) -> str:
+        """The user turn: the message, after the CV facts relevant to it when retrieval is on"""
+        return message if self.knowledge is None else self.knowledge.augment(message)
+
+    @abstractmethod
+    async def agenerate(self, message: str) -> str:
+        """The whole reply to ``message``."""
+
+    async def astream(self, message: str) -> AsyncIterator[str]:
+        """Yield the reply in pieces; providers without streaming yield it whole."""
+        reply = await self.agenerate(message)
+        if reply:
+            yield reply
+
+    def generate(self, message: str, cancel: Optional[CancelToken] = None) -> str:
+        """Blocking form of ``agenerate``; an empty string if ``cancel`` fired first."""
+        try:
+            return run_async(self.agenerate(message), cancel=cancel)
+        except concurrent.futures.CancelledError:
+            if cancelled(cancel):
+                return ""
+            raise
+
+    def stream(self, message: str, cancel: Optional[CancelToken] = None) -> Iterator[str]:
+        """Blocking iterator over ``astream``; ``cancel`` ends it and closes the upstream request."""
+        return iterate_async(self.astream(message), cancel=cancel)
+
+    def is_cacheable(self, message: str, reply: str) -> bool:
+        """Only real model output is cached, never a fallback."""
+        return bool(reply)
+
+    def preload(self) -> None:
+        """Warm the model in the background at server start; most providers have nothing to warm."""
+
+
+class OllamaLLM(LLMProvider):
+    name = "ollama"
+
+    def __init__(self) -> None:
+        super().__init__(CV_SYSTEM_PROMPT, settings.ollama_model, 0.4)
+
+    async def agenerate(self, message: str) -> str:
+        from app.llm import agenerate_response
+
+        return await agenerate_response(self.prompt(message), system=self.system, temperature=self.temperature)
+
+    def astream(self, message: str) -> AsyncIterator[str]:
+        from app.llm import astream_response
+
+        return astream_response(self.prompt(message), system=self.system, temperature=self.temperature)
+
+    def is_cacheable(self, message: str, reply: str) -> bool:
+        from app.llm import FALLBACK_REPLY
+
+        return bool(reply) and reply != FALLBACK_REPLY
+
+    def preload(self) -> None:
+        """Load the model and evaluate the system prompt before the first visitor"""
+        if settings.ollama_preload:
+            from app.llm import preload_in_background
+
+            preload_in_background(self.system)
+
+
+class OpenAILLM(LLMProvider):
+    name = "openai"
+    url = "https://api.openai.com/v1/chat/completions"
+
+    def __init__(self) -> None:
+        knowledge = create_knowledge_index()
+        system = JARVIS_SYSTEM_PROMPT if knowledge is None else JARVIS_RETRIEVAL_PROMPT
+        super().__init__(system, settings.openai_chat_model, 0.4, knowledge)
+
+    def _request(self, message: str, stream: bool) -> tuple:
+        headers = {
+            'Authorization': f"Bearer {os.getenv('OPENAI_API_KEY')}",
+            'Content-Type': 'application/json'
+        }
+        data = {
+            'model': self.model,
+            'messages': [
+                {'role': 'system', 'content': self.system},
+                {'role': 'user', 'content': self.prompt(message)}
+            ],
+            'max_tokens': 200,
+            'temperature': self.temperature,
+            'top_p': 0.9,
+            'frequency_penalty': 0.1,
+            'presence_penalty': 0.1,
+            'stream': stream
+        }
+        return headers, data
+
+    async def agenerate(self, message: str) -> str:
+        if not os.getenv('OPENAI_API_KEY'):
+            return fallback_response(message)
+        try:
+            headers, data = self._request(message, stream=False)
+            response = await upstream.apost(self.url, headers=headers, json=data)
+            if response.status_code == 200:
+                return response.json()['choices'][0]['message']['content'].strip()
+            print(f"OpenAI API error: {response.status_code}")
+        except Exception as e:
+            print(f"AI generation error: {e}")
+        return fallback_response(message)
+
+    async def astream(self, message: str) -> AsyncIterator[str]:
+        if not os.getenv('OPENAI_API_KEY'):
+            yield fallback_response(message)
+            return
+
+        headers, data = self._request(message, stream=True)
+        produced = False
+        try:
+            response = await upstream.apost(self.url, stream=True, headers=headers, json=data)
+            try:
+                if response.status_code != 200:
+                    print(f"OpenAI API error: {response.status_code}")
+                    yield fallback_response(message)
+                    return
+
+                # OpenAI sends Server-Sent Events: "data: {...}" lines ending with "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line or not line.startswith('data: '):
+                        continue
+                    chunk = line[len('data: '):]
+                    if chunk == '[DONE]':
+                        break
+                    delta = json.loads(chunk)['choices'][0].get('delta', {})
+                    token = delta.get('content')
+                    if token:
+                        produced = True
+                        yield token
+                else:
+                    raise upstream.StreamInterrupted("OpenAI closed the stream before [DONE]")
+            finally:
+                await response.aclose()
+        except Exception as e:
+            print(f"AI streaming error: {e}")
+            # A partial reply must not pass for a complete one (or be cached as one)
+            if produced:
+                raise upstream.StreamInterrupted(f"OpenAI stream interrupted: {e}") from e
+            yield fallback_response(message)
+
+    def is_cacheable(self, message: str, reply: str) -> bool:
+        return bool(reply) and reply != fallback_response(message)
+
+
+class HuggingFaceLLM(LLMProvider):
+    name = "huggingface"
+
+    def __init__(self) -> None:
+        knowledge = create_knowledge_index()
+        system = JARVIS_SYSTEM_PROMPT if knowledge is None else JARVIS_RETRIEVAL_PROMPT
+        super().__init__(system, settings.hf_chat_model, 0.7, knowledge)
+
+    async def agenerate(self, message: str) -> str:
+        hf_api_key = os.getenv('HUGGINGFACE_API_KEY')
+        if not hf_api_key:
+            return fallback_response(message)
+        try:
+            headers = {
+                'Authorization': f'Bearer {hf_api_key}',
+                'Content-Type': 'application/json'
+            }
+            data = {
+                'inputs': f"{self.system}\n\nUser: {self.prompt(message)}\nJARVIS:",
+                'parameters': {
+                    'max_length': 200,
+                    'temperature': self.temperature,
+                    'do_sample': True
+                }
+            }
+            response = await upstream.apost(
+                f'https://api-inference.huggingface.co/models/{self.model}',
+                headers=headers,
+                json=data
+            )
+            if response.status_code != 200:
+                print(f"Hugging Face API error: {response.status_code}")
+                return fallback_response(message)
+            result = response.json()
+            if isinstance(result, list) and len(result) > 0:
+                generated_text = result[0].get('generated_text', '')
+                # Extract just the JARVIS response part
+                if 'JARVIS:' in generated_text:
+                    return generated_text.split('JARVIS:')[-1].strip() or fallback_response(message)
+                return generated_text
+        except Exception as e:
+            print(f"AI generation error: {e}")
+        return fallback_response(message)
+
+    def is_cacheable(self, message: str, reply: str) -> bool:
+        return bool(reply) and reply != fallback_response(message)
+
+
+class CannedLLM(LLMProvider):
+    """Keyword-matched replies for deployments without any model."""
+
+    name = "canned"
+
+    def __init__(self) -> None:
+        super().__init__(JARVIS_SYSTEM_PROMPT, "canned", 0.0)
+
+    async def agenerate(self, message: str) -> str:
+        return fallback_response(message)
+
+    def is_cacheable(self, message: str, reply: str) -> bool:
+        # Already instant; caching would only take memory
+        return False
+
+
+LLM_PROVIDERS = {
+    "ollama": OllamaLLM,
+    "openai": OpenAILLM,
+    "huggingface": HuggingFaceLLM,
+    "canned": CannedLLM,
+}
+
+
+def create_llm(name: str) -> LLMProvider:
+    if name not in LLM_PROVIDERS:
+        raise ValueError(f"Unknown LLM provider {name!r}; choose from {', '.join(LLM_PROVIDERS)}")
+    return LLM_PROVIDERS[name]()
@@ -0,0 +1,143 @@
+"""Speech-to-text providers: in-process faster-whisper, OpenAI Whisper and a demo placeholder."""
+
+import mimetypes
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from app import upstream
+from app.config import settings
+
+
+DEMO_TRANSCRIPT = 'Demo transcription - voice input detected'
+UNAVAILABLE_TRANSCRIPT = 'Voice transcription not available in demo mode'
+
+
+class STTProvider(ABC):
+    name = ""
+    # Re-transcribe the growing segment while the user speaks; providers that
+    # bill per second of uploaded audio only transcribe finished segments
+    live_partials = True
+
+    @abstractmethod
+    def transcribe(self, data: bytes, suffix: str = '.webm') -> str:
+        """Transcribe an uploaded recording."""
+
+    def live_transcriber(self) -> Optional[Callable]:
+        """Callable transcribing 16 kHz float32 segments of a live stream, if supported."""
+        return None
+
+    def ready(self) -> bool:
+        return True
+
+    def status(self) -> dict:
+        return {'provider': self.name, 'ready': self.ready()}
+
+    def stats(self) -> dict:
+        return {}
+
+
+class WhisperSTT(STTProvider):
+    """faster-whisper in this process, behind the bounded transcription scheduler."""
+
+    name = "whisper"
+
+    def __init__(self) -> None:
+        from app import models
+        from app.scheduler import create_transcription_scheduler
+        from app.stt import STT
+
+        self._models = models
+        self._stt = STT()
+        self._scheduler = create_transcription_scheduler()
+        # Load and warm Whisper before the first request instead of during it
+        if settings.whisper_eager_load:
+            models.preload_in_background()
+
+    def transcribe(self, data: bytes, suffix: str = '.webm') -> str:
+        # Raises QueueFull when the worker pool and its queue are saturated
+        return self._scheduler.run(self._stt.transcribe_bytes, data, suffix=suffix)
+
+    def live_transcriber(self) -> Optional[Callable]:
+        # Live segments share the bounded worker pool with uploads; raises QueueFull when saturated
+        return lambda audio: self._scheduler.run(self._stt.transcribe_array, audio)
+
+    def ready(self) -> bool:
+        return not settings.whisper_eager_load or self._models.is_ready()
+
+    def status(self) -> dict:
+        return {'provider': self.name, **self._models.status()}
+
+    def stats(self) -> dict:
+        return {**self._scheduler.stats(), 'batching': self._stt.batch_stats()}
+
+
+class OpenAISTT(STTProvider):
+    name = "openai"
+    # Every partial re-uploads the whole segment so far: a 10 s utterance
+    # would be billed for about 55 s of audio
+    live_partials = False
+    url = 'https://api.openai.com/v1/audio/transcriptions'
+
+    def transcribe(self, data: bytes, suffix: str = '.webm') -> str:
+        filename = f'audio{suffix}'
+        mime = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = upstream.post(
+            self.url,
+            headers={'Authorization': f"Bearer {os.getenv('OPENAI_API_KEY')}"},
+            files={
+                'file': (filename, data, mime),
+                'model': (None, 'whisper-1'),
+                'language': (None, 'en')
+            }
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f'Transcription failed: {response.status_code}')
+        return response.json()['text']
+
+    def live_transcriber(self) -> Optional[Callable]:
+        from app.streaming import np, wav_bytes
+
+        if np is None:
+            return None
+
+        def transcribe_pcm(audio) -> str:
+            try:
+                return self.transcribe(wav_bytes(audio), suffix='.wav')
+            except Exception as e:
+                print(f"STT error: {e}")
+                return ''
+
+        return transcribe_pcm
+
+
+class DemoSTT(STTProvider):
+    """Placeholder for deployments without speech recognition; answers every recording with a fixed text."""
+
+    def __init__(self, name: str = "demo", transcript: str = DEMO_TRANSCRIPT) -> None:
+        self.name = name
+        self.transcript = transcript
+
+    def transcribe(self, data: bytes, suffix: str = '.webm') -> str:
+        return self.transcript
+
+
+def create_stt(name: str) -> STTProvider:
+    """Build the STT provider, degrading to the next best one when it cannot run here."""
+    if name == "openai":
+        if os.getenv('OPENAI_API_KEY'):
+            return OpenAISTT()
+        print("OPENAI_API_KEY not set, transcribing locally")
+        name = "whisper"
+    if name == "whisper":
+        try:
+            import faster_whisper  # type: ignore  # noqa: F401
+            return WhisperSTT()
+        except ImportError:
+            print("faster-whisper not installed, speech recognition disabled")
+            name = "none"
+    if name == "demo":
+        return DemoSTT()
+    if name == "none":
+        return DemoSTT("none", UNAVAILABLE_TRANSCRIPT)
+    raise ValueError(f"Unknown STT provider {name!r}; choose from openai, whisper, demo, none")
@@ -0,0 +1,56 @@
+"""Speech synthesis providers for the web server."""
+
+from typing import Iterator, Optional, Tuple
+
+from app.aio import run_async
+from app.audio_cache import audio_key, create_audio_cache, preprocess_text, speech_stream
+from app.cancel import CancelToken
+
+
+class EdgeTTS:
+    """edge-tts behind the content-addressed audio cache."""
+
+    name = "edge"
+    mimetype = 'audio/mpeg'
+
+    def __init__(self) -> None:
+        from app.tts import EDGE_RATE, EDGE_VOICE
+
+        self.voice = EDGE_VOICE
+        self.rate = EDGE_RATE
+        self.cache = create_audio_cache()
+
+    def key(self, text: str) -> str:
+        return audio_key(text, self.voice, self.rate)
+
+    def is_cached(self, key: str) -> bool:
+        return self.cache is not None and self.cache.contains(key)
+
+    def render(self, text: str, cancel: Optional[CancelToken] = None) -> Tuple[str, bytes]:
+        """Return ``(key, mp3)``, synthesizing only on a cache miss."""
+        from app.tts import synthesize_speech
+
+        def render():
+            return run_async(synthesize_speech(preprocess_text(text), self.voice, self.rate), cancel=cancel)
+
+        if self.cache is None:
+            return self.key(text), render()
+        return self.cache.get_or_render(text, self.voice, self.rate, render)
+
+    def stream(self, text: str, cancel: Optional[CancelToken] = None) -> Iterator[bytes]:
+        """MP3 chunks as they are synthesized (or read back from the cache); ``cancel`` stops synthesis."""
+        return speech_stream(self.cache, text, self.voice, self.rate, cancel)
+
+
+def create_tts(name: str) -> Optional[EdgeTTS]:
+    """Build the TTS provider, or None when voice output is off."""
+    if name == "edge":
+        try:
+            import edge_tts  # type: ignore  # noqa: F401
+        except ImportError:
+            print("edge-tts not installed, voice output disabled")
+            return None
+        return EdgeTTS()
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown TTS provider {name!r}; choose from edge, none")
@@ -0,0 +1,213 @@
+"""HTTP routes shared by every profile."""
+
+import base64
+import json
+import os
+
+from flask import Response, jsonify, render_template, request, stream_with_context, url_for
+
+from app.cancel import CancelToken
+from app.scheduler import QueueFull
+from app.text import split_sentences
+
+from .cv_data import CV_DATA
+
+
+def register_routes(app, services) -> None:
+    chat_service = services.chat
+    stt = services.stt
+    tts = services.tts
+    active_replies = services.active_replies
+
+    def cancellable(reply_id, produce):
+        """Yield from ``produce(cancel)`` under a token the page can cancel by reply id.
+
+        Pages send a ``reply`` id with every request of a turn and name it in
+        the Socket.IO ``cancel`` event on barge-in. The token is also
+        cancelled when the client disconnects and the response is closed, so
+        the upstream request stops then instead of at the next failed write.
+        """
+        cancel = active_replies.begin(reply_id) if reply_id else CancelToken()
+        try:
+            yield from produce(cancel)
+        finally:
+            cancel.cancel()
+            if reply_id:
+                active_replies.end(reply_id, cancel)
+
+    @app.route('/')
+    def index():
+        return render_template(services.profile.template, cv_data=CV_DATA)
+
+    @app.route('/api/chat', methods=['POST'])
+    def chat():
+        data = request.get_json(silent=True) or {}
+        message = data.get('message', '')
+        voice_enabled = data.get('voice_enabled', False)
+
+        if not message:
+            return jsonify({'error': 'No message provided'}), 400
+
+        try:
+            response = chat_service.reply(message)
+            return jsonify({'response': response, 'voice_enabled': voice_enabled})
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/chat/stream', methods=['POST'])
+    def chat_stream():
+        """Stream the reply as Server-Sent Events, one event per token"""
+        data = request.get_json(silent=True) or {}
+        message = data.get('message', '')
+
+        if not message:
+            return jsonify({'error': 'No message provided'}), 400
+
+        def events(cancel):
+            try:
+                for token in chat_service.stream(message, cancel):
+                    yield f"data: {json.dumps({'token': token})}\n\n"
+                if cancel.cancelled:
+                    yield f"data: {json.dumps({'cancelled': True})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'done': True})}\n\n"
+            except Exception as e:
+                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+        return Response(stream_with_context(cancellable(data.get('reply'), events)), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+
+    @app.route('/api/cache/stats')
+    def cache_stats():
+        """Report response and semantic cache hit/miss counters"""
+        return jsonify(chat_service.stats())
+
+    @app.route('/api/transcribe/stats')
+    def transcribe_stats():
+        """Report transcription queue depth, wait times and batching"""
+        return jsonify({'provider': stt.name, **stt.stats()})
+
+    @app.route('/healthz')
+    def healthz():
+        """Liveness: the process is up and serving requests"""
+        return jsonify({'status': 'ok', 'profile': services.profile.name})
+
+    @app.route('/readyz')
+    def readyz():
+        """Readiness: 503 until the speech model is warm"""
+        status = stt.status()
+        if not stt.ready():
+            return jsonify(status), 503
+        return jsonify(status)
+
+    @app.route('/api/voice', methods=['POST'])
+    def generate_voice():
+        data = request.get_json(silent=True) or {}
+        text = data.get('text', '')
+
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+
+        if tts is None:
+            return jsonify({'status': 'success', 'message': 'Voice response generated', 'audio_url': None})
+
+        try:
+            # Clips are content-addressed, so a matching ETag means the client already has it
+            key = tts.key(text)
+            headers = {
+                'ETag': f'"{key}"',
+                'Cache-Control': 'private, max-age=86400'
+            }
+            if key in request.if_none_match and tts.is_cached(key):
+                return '', 304, headers
+
+            cancel = active_replies.begin(data['reply']) if data.get('reply') else CancelToken()
+            try:
+                _key, audio_data = tts.render(text, cancel)
+            finally:
+                if data.get('reply'):
+                    active_replies.end(data['reply'], cancel)
+            if cancel.cancelled:
+                return '', 204
+            return audio_data, 200, {
+                'Content-Type': tts.mimetype,
+                'Content-Disposition': 'inline; filename="jarvis_response.mp3"',
+                **headers
+            }
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/voice/segments', methods=['POST'])
+    def voice_segments():
+        """Split a reply into sentences, each streamed from /api/voice/stream in order"""
+        data = request.get_json(silent=True) or {}
+        text = data.get('text', '')
+        reply_id = data.get('reply')
+
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+        if tts is None:
+            return jsonify({'error': 'Voice output is disabled'}), 503
+
+        # Clients play segment N while fetching N+1, so the first audio only waits on the first sentence
+        segments = [
+            {'index': index, 'text': sentence, 'url': url_for('stream_voice', text=sentence, reply=reply_id)}
+            for index, sentence in enumerate(split_sentences(text))
+        ]
+        return jsonify({'segments': segments})
+
+    @app.route('/api/voice/stream', methods=['GET'])
+    def stream_voice():
+        """Stream MP3 audio as it is synthesized so playback starts with the first chunk"""
+        text = request.args.get('text', '')
+
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+        if tts is None:
+            return jsonify({'error': 'Voice output is disabled'}), 503
+
+        key = tts.key(text)
+        headers = {
+            'ETag': f'"{key}"',
+            'Cache-Control': 'private, max-age=86400',
+            'X-Accel-Buffering': 'no'
+        }
+        if key in request.if_none_match and tts.is_cached(key):
+            return '', 304, headers
+
+        stream = cancellable(request.args.get('reply'), lambda cancel: tts.stream(text, cancel))
+        return Response(stream_with_context(stream), mimetype=tts.mimetype, headers=headers)
+
+    @app.route('/api/transcribe', methods=['POST'])
+    def transcribe_audio():
+        """Transcribe an uploaded recording (multipart 'audio', or base64 'audio_data' from older clients)"""
+        try:
+            legacy = 'audio' not in request.files
+            if legacy:
+                audio_data = request.form.get('audio_data')
+                if not audio_data:
+                    return jsonify({'error': 'No audio file provided'}), 400
+                data, suffix = base64.b64decode(audio_data), '.wav'
+            else:
+                audio_file = request.files['audio']
+                if audio_file.filename == '':
+                    return jsonify({'error': 'No audio file selected'}), 400
+                data = audio_file.read()
+                suffix = os.path.splitext(audio_file.filename or '')[1] or '.webm'
+
+            if not stt.ready():
+                return jsonify({'error': 'Speech model is still loading'}), 503, {'Retry-After': '5'}
+
+            # Decoded and transcribed in memory; local models run on the bounded worker pool
+            transcript = stt.transcribe(data, suffix=suffix)
+
+            if legacy:
+                return jsonify({'status': 'success', 'transcription': transcript, 'transcript': transcript})
+            return jsonify({'transcript': transcript})
+
+        except QueueFull as e:
+            return jsonify({'error': 'Too many transcriptions in progress'}), 503, {'Retry-After': str(e.retry_after)}
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
@@ -0,0 +1,146 @@
+"""Socket.IO events shared by every profile."""
+
+import base64
+
+from flask import request
+from flask_socketio import emit
+
+
+def register_socket_handlers(socketio, services) -> None:
+    chat_service = services.chat
+    tts = services.tts
+    live_streams = services.live_streams
+    active_replies = services.active_replies
+
+    @socketio.on('connect')
+    def handle_connect():
+        emit('connected', {'status': 'Connected to JARVIS'})
+
+    @socketio.on('disconnect')
+    def handle_disconnect():
+        active_replies.cancel(request.sid)
+        if live_streams is not None:
+            live_streams.close(request.sid)
+
+    @socketio.on('voice_message')
+    def handle_voice_message(data):
+        """Reply to a message in one piece"""
+        try:
+            message = (data or {}).get('message', '')
+            if message:
+                emit('jarvis_response', {
+                    'text': chat_service.reply(message),
+                    'audio_available': tts is not None
+                })
+        except Exception as e:
+            emit('error', {'message': str(e)})
+
+    @socketio.on('chat_stream')
+    def handle_chat_stream(data):
+        """Stream the reply token by token over Socket.IO"""
+        sid = request.sid
+        cancel = active_replies.begin(sid)
+        try:
+            message = (data or {}).get('message', '')
+
+            if message:
+                for token in chat_service.stream(message, cancel):
+                    emit('jarvis_token', {'token': token})
+                if cancel.cancelled:
+                    emit('jarvis_cancelled', {})
+                else:
+                    emit('jarvis_done', {})
+            else:
+                emit('error', {'message': 'No message provided'})
+
+        except Exception as e:
+            emit('error', {'message': str(e)})
+        finally:
+            active_replies.end(sid, cancel)
+
+    @socketio.on('cancel')
+    def handle_cancel(data=None):
+        """Barge-in: stop the replies and synthesis still running for this client,
+        including the HTTP streams of the reply id it names"""
+        stopped = active_replies.cancel(request.sid)
+        reply_id = (data or {}).get('reply') if isinstance(data, dict) else None
+        if reply_id:
+            stopped += active_replies.cancel(reply_id)
+        emit('cancelled', {'stopped': stopped})
+
+    @socketio.on('generate_audio')
+    def handle_audio_generation(data):
+        """Acknowledge; clients fetch the audio from /api/voice/stream"""
+        if (data or {}).get('text'):
+            emit('audio_ready', {'status': 'success'})
+
+    @socketio.on('generate_voice')
+    def handle_generate_voice(data):
+        """Synthesize a whole reply and send it back base64-encoded"""
+        sid = request.sid
+        cancel = active_replies.begin(sid)
+        try:
+            text = (data or {}).get('text', '')
+            if not text:
+                emit('error', {'message': 'No text provided'})
+            elif tts is None:
+                emit('voice_ready', {'status': 'success', 'text': text})
+            else:
+                try:
+                    key, audio_data = tts.render(text, cancel)
+                    result = {
+                        'status': 'success',
+                        'audio_data': base64.b64encode(audio_data).decode('utf-8'),
+                        'format': tts.mimetype,
+                        'audio_key': key
+                    }
+                except Exception as e:
+                    print(f"TTS error: {e}")
+                    result = {'status': 'error', 'message': f'Voice generation failed: {str(e)}'}
+                if not cancel.cancelled:
+                    emit('voice_ready', result)
+        except Exception as e:
+            emit('error', {'message': str(e)})
+        finally:
+            active_replies.end(sid, cancel)
+
+    @socketio.on('audio_start')
+    def handle_audio_start(data):
+        """Open a live transcription stream for this socket"""
+        try:
+            if live_streams is None:
+                emit('transcript_ready', {'live': False})
+                return
+            data = data or {}
+            sample_rate = int(data.get('sample_rate', 16000))
+            if live_streams.start(request.sid, sample_rate, recording=int(data.get('recording', 0))):
+                emit('transcript_ready', {'live': True})
+        except Exception as e:
+            emit('error', {'message': str(e)})
+
+    @socketio.on('audio_data')
+    def handle_audio_data(data):
+        """Queue a numbered block of 16-bit PCM for the socket's live transcription"""
+        try:
+            if isinstance(data, dict):
+                pcm, seq, recording = data.get('pcm'), data.get('seq'), int(data.get('recording', 0))
+            else:
+                pcm, seq, recording = data, None, 0
+            if live_streams is None or not pcm:
+                emit('audio_received', {'status': 'success'})
+            else:
+                live_streams.feed(request.sid, pcm, None if seq is None else int(seq), recording)
+        except Exception as e:
+            emit('error', {'message': str(e)})
+
+    @socketio.on('audio_end')
+    def handle_audio_end(data=None):
+        """Recording stopped: emit the final transcript once every block is in"""
+        try:
+            if live_streams is not None:
+                data = data or {}
+                blocks = data.get('blocks')
+                live_streams.finish(request.sid, None if blocks is None else int(blocks),
+                                    recording=int(data.get('recording', 0)))
+        except Exception as e:
+            emit('error', {'message': str(e)})